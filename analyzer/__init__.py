@@ -2,7 +2,7 @@
 Analyzer package – exposes all Analyzer subclasses for external import.
 """
 
-from pydiscovery.analyzer.base import Analyzer
+from pydiscovery.analyzer.base import AnalysisPass, Analyzer, AnalyzerDispatcher
 from pydiscovery.analyzer.async_analyzer import AsyncAnalyzer
 from pydiscovery.analyzer.config_analyzer import ConfigAnalyzer
 from pydiscovery.analyzer.context_manager_analyzer import ContextManagerAnalyzer
@@ -23,9 +23,12 @@ from pydiscovery.analyzer.function_analyzer import FunctionAnalyzer
 from pydiscovery.analyzer.data_flow_analyzer import DataFlowAnalyzer
 from pydiscovery.analyzer.control_flow_analyzer import ControlFlowAnalyzer
 from pydiscovery.analyzer.runtime_monitor import RuntimeMonitor
+from pydiscovery.analyzer.sampling_monitor import SamplingMonitor
 
 __all__ = [
+    "AnalysisPass",
     "Analyzer",
+    "AnalyzerDispatcher",
     "AsyncAnalyzer",
     "ConfigAnalyzer",
     "ContextManagerAnalyzer",
@@ -46,4 +49,5 @@ __all__ = [
     "DataFlowAnalyzer",
     "ControlFlowAnalyzer",
     "RuntimeMonitor",
+    "SamplingMonitor",
 ]
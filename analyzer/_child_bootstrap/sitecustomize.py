@@ -0,0 +1,33 @@
+# pydiscovery/analyzer/_child_bootstrap/sitecustomize.py
+"""
+Put first on ``PYTHONPATH`` by `ProcessTracer`: every Python interpreter
+the traced program starts imports this at startup, runs the `sitecustomize`
+it shadows (if any) and starts tracing per ``PYDISCOVERY_TRACE``.
+"""
+import os
+import sys
+from importlib.machinery import PathFinder
+from importlib.util import module_from_spec
+
+_here = os.path.dirname(os.path.abspath(__file__))
+
+# 1. the sitecustomize we shadow ------------------------------------------
+_spec = PathFinder.find_spec(
+    "sitecustomize", [p for p in sys.path if os.path.abspath(p or ".") != _here]
+)
+if _spec is not None and _spec.loader is not None:
+    _module = module_from_spec(_spec)
+    _spec.loader.exec_module(_module)
+    vars().update({k: v for k, v in vars(_module).items() if not k.startswith("__")})
+
+# 2. tracing ---------------------------------------------------------------
+if os.environ.get("PYDISCOVERY_TRACE"):
+    _root = os.path.dirname(os.path.dirname(os.path.dirname(_here)))  # holds pydiscovery/
+    if _root not in sys.path:
+        sys.path.append(_root)
+    try:
+        from pydiscovery.analyzer.process_tracer import bootstrap
+    except ImportError as e:
+        print(f"[pydiscovery] child tracing disabled: {e}", file=sys.stderr)
+    else:
+        bootstrap()
@@ -0,0 +1,108 @@
+# pydiscovery/analyzer/analysis_cache.py
+"""
+Persistent per‑file analysis cache for incremental re‑runs.
+
+Entries are keyed by the file's path relative to the project root and hold
+the pickled `FileAnalysis` together with the source's content hash.  A hit
+is decided in two steps:
+
+1. `st_mtime_ns` + `st_size` unchanged → hit without reading the file;
+2. otherwise the file is hashed and compared with the stored digest.
+
+The whole cache is discarded when the project root, the interpreter's
+major.minor version or `ANALYZER_VERSION` differ from what it was built with.
+Each project root gets its own file (`file_for()`), so analysing several
+projects in turn keeps every cache warm.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from pydiscovery.analyzer.file_analysis import ANALYZER_VERSION, FileAnalysis, content_digest
+from pydiscovery.util.knowledge_graph_file_handler import KnowledgeGraphFileHandler
+
+LOG = logging.getLogger(__name__)
+
+# rel_path -> (mtime_ns, size, digest, pickled FileAnalysis)
+_Entry = Tuple[int, int, str, bytes]
+
+
+class AnalysisCache:
+    # ----------------------------------------------------------------- #
+    def __init__(self, root: Path, path: Path | None = None) -> None:
+        self._root = root.resolve()
+        self.path = path or self.file_for(self._root)
+        self._entries: Dict[str, _Entry] = {}
+        self._fresh: Dict[str, _Entry] = {}          # entries seen this run
+        self._stats: Dict[str, Tuple[int, int]] = {}  # stat taken before a miss
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, root: Path, path: Path | None = None) -> "AnalysisCache":
+        """Return a cache for *root*; empty if missing, corrupt or stale."""
+        cache = cls(root, path)
+        try:
+            with cache.path.open("rb") as fh:
+                header, entries = pickle.load(fh)
+        except FileNotFoundError:
+            return cache
+        except Exception as err:  # noqa: BLE001 – any unreadable cache is just dropped
+            LOG.debug("Ignoring unreadable cache %s – %s", cache.path, err)
+            return cache
+        if header == cache._header():
+            cache._entries = entries
+        else:
+            LOG.info("Analysis cache is stale (%s) – rebuilding", cache.path.name)
+        return cache
+
+    @staticmethod
+    def file_for(root: Path) -> Path:
+        """Default cache file for *root*, next to the knowledge graph."""
+        tag = hashlib.blake2b(str(root.resolve()).encode("utf-8"), digest_size=6).hexdigest()
+        return KnowledgeGraphFileHandler.FILE.with_name(f"analysis_cache.{tag}.pickle")
+
+    def save(self) -> None:
+        """Persist entries looked up this run; vanished files are dropped."""
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open("wb") as fh:
+            pickle.dump((self._header(), self._fresh), fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+
+    # ----------------------------------------------------------------- #
+    def lookup(self, path: Path, rel: str) -> Optional[FileAnalysis]:
+        st = path.stat()
+        stat = (st.st_mtime_ns, st.st_size)
+        entry = self._entries.get(rel)
+        if entry is not None:
+            if entry[:2] == stat:
+                return self._hit(rel, entry)
+            if content_digest(path.read_bytes()) == entry[2]:
+                return self._hit(rel, (stat[0], stat[1], entry[2], entry[3]))
+        self.misses += 1
+        self._stats[rel] = stat
+        return None
+
+    def store(self, result: FileAnalysis) -> None:
+        """Record a freshly computed *result* previously reported as a miss."""
+        stat = self._stats.pop(result.rel, None)
+        if stat is None:
+            return
+        blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        self._fresh[result.rel] = (stat[0], stat[1], result.digest, blob)
+
+    # ----------------------------------------------------------------- #
+    def _hit(self, rel: str, entry: _Entry) -> FileAnalysis:
+        self.hits += 1
+        self._fresh[rel] = entry
+        # unpickled per run, so later analysers may mutate elements freely
+        return pickle.loads(entry[3])
+
+    def _header(self) -> Tuple[int, Tuple[int, int], str]:
+        return ANALYZER_VERSION, sys.version_info[:2], str(self._root)
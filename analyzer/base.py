@@ -1,21 +1,101 @@
 from __future__ import annotations
 
 import ast
+from collections import deque
 from pathlib import Path
-from abc import ABC, abstractmethod
-from typing import Optional
+from abc import ABC
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Type
 
 from pydiscovery.repository.code_element_repository import CodeElementRepository
 
+NodeCallback = Callable[[ast.AST], None]
 
-class Analyzer(ABC):
+
+class Scope:
+    """Lexical scope of a node: the enclosing module, class or function."""
+
+    __slots__ = ("kind", "name", "qualname", "node", "parent")
+
+    def __init__(
+        self,
+        kind: str,
+        name: str,
+        qualname: str,
+        node: ast.AST,
+        parent: "Scope | None" = None,
+    ) -> None:
+        self.kind = kind            # "module" | "class" | "function"
+        self.name = name
+        self.qualname = qualname    # e.g. "pkg.mod.Class.method"
+        self.node = node            # the Module / ClassDef / FunctionDef
+        self.parent = parent
+
+    def child(self, node: ast.ClassDef | ast.FunctionDef | ast.AsyncFunctionDef) -> "Scope":
+        kind = "class" if isinstance(node, ast.ClassDef) else "function"
+        return Scope(kind, node.name, f"{self.qualname}.{node.name}", node, self)
+
+
+_SCOPE_NODES = (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+def line_range(node: ast.ClassDef | ast.FunctionDef | ast.AsyncFunctionDef) -> List[int]:
+    """
+    ``[first, last]`` source line of a class / def, decorators included –
+    the first line is what the runtime code object reports as `co_firstlineno`.
+    """
+    first = min([node.lineno, *(deco.lineno for deco in node.decorator_list)])
+    return [first, getattr(node, "end_lineno", None) or node.lineno]
+
+
+class AnalysisPass:
+    """
+    Hooks driven by `AnalyzerDispatcher` during a single walk of a file:
+
+    * `begin_file()` before the walk,
+    * `visit_<NodeType>(node)` for every node of that type (e.g.
+      `visit_ClassDef`), in `ast.walk` order,
+    * `end_file()` after the walk.
+
+    Every pass finds the dotted name of the file's module in `self.module`;
+    passes that set `tracks_scope = True` also find the enclosing `Scope` of
+    the node being visited in `self.scope` (the module scope in `begin_file`).
+    """
+
+    tracks_scope: bool = False
+    scope: Scope | None = None
+    module: str | None = None
+
+    _node_types: Dict[type, Tuple[Tuple[Type[ast.AST], str], ...]] = {}
+
+    def begin_file(self, file_path: Path, tree: ast.AST) -> None:
+        pass
+
+    def end_file(self, file_path: Path, tree: ast.AST) -> None:
+        pass
+
+    def node_callbacks(self) -> List[Tuple[Type[ast.AST], NodeCallback]]:
+        """(node type, bound callback) pairs declared via `visit_*` methods."""
+        cls = type(self)
+        table = AnalysisPass._node_types.get(cls)
+        if table is None:
+            table = tuple(
+                (getattr(ast, attr[6:]), attr)
+                for attr in dir(cls)
+                if attr.startswith("visit_") and isinstance(getattr(ast, attr[6:], None), type)
+            )
+            AnalysisPass._node_types[cls] = table
+        return [(node_type, getattr(self, attr)) for node_type, attr in table]
+
+
+class Analyzer(AnalysisPass, ABC):
     """Common interface for all analyzers."""
 
     def __init__(self, repository: CodeElementRepository) -> None:
         self.repo = repository
 
-    @abstractmethod
-    def analyse(self, file_path: Path, tree: ast.AST) -> None: ...
+    def analyse(self, file_path: Path, tree: ast.AST) -> None:
+        """Run this analyser alone; prefer `AnalyzerDispatcher` for several."""
+        AnalyzerDispatcher([self]).run(file_path, tree)
 
     def finalize(self, root: Path) -> None:  # optional
         pass
@@ -27,3 +107,67 @@ class Analyzer(ABC):
             return ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
         except (SyntaxError, UnicodeDecodeError):
             return None
+
+
+class AnalyzerDispatcher:
+    """
+    Walks each tree **once** and routes every node to the analysers that
+    declared interest in its type, so cost grows with file size rather than
+    file size × analyser count.  For a given node, callbacks run in the order
+    the analysers were passed in.
+
+    Scope tracking is only paid for when some analyser asks for it; nodes are
+    visited in exactly `ast.walk` order either way.
+    """
+
+    def __init__(self, analyzers: Iterable[AnalysisPass]) -> None:
+        self._analyzers = list(analyzers)
+        self._scoped = [an for an in self._analyzers if an.tracks_scope]
+        self._routes: Dict[type, List[NodeCallback]] = {}
+        for an in self._analyzers:
+            for node_type, callback in an.node_callbacks():
+                self._routes.setdefault(node_type, []).append(callback)
+
+    def run(self, file_path: Path, tree: ast.AST, module: str | None = None) -> None:
+        """Walk *tree* once; *module* names the module scope (default: file stem)."""
+        module = module or file_path.stem
+        module_scope = Scope("module", module, module, tree)
+        for an in self._scoped:
+            an.scope = module_scope
+        for an in self._analyzers:
+            an.module = module
+            an.begin_file(file_path, tree)
+        if self._routes:
+            if self._scoped:
+                self._walk_scoped(tree, module_scope)
+            else:
+                self._walk(tree)
+        for an in self._scoped:
+            an.scope = module_scope
+        for an in self._analyzers:
+            an.end_file(file_path, tree)
+
+    # ------------------------------------------------------------------
+    def _walk(self, tree: ast.AST) -> None:
+        routes = self._routes
+        for node in ast.walk(tree):
+            callbacks = routes.get(type(node))
+            if callbacks:
+                for callback in callbacks:
+                    callback(node)
+
+    def _walk_scoped(self, tree: ast.AST, module_scope: Scope) -> None:
+        # breadth‑first like ast.walk, carrying each node's enclosing scope
+        routes = self._routes
+        scoped = self._scoped
+        todo = deque([(tree, module_scope)])
+        while todo:
+            node, scope = todo.popleft()
+            inner = scope.child(node) if isinstance(node, _SCOPE_NODES) else scope
+            todo.extend((child, inner) for child in ast.iter_child_nodes(node))
+            callbacks = routes.get(type(node))
+            if callbacks:
+                for an in scoped:
+                    an.scope = scope
+                for callback in callbacks:
+                    callback(node)
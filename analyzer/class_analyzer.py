@@ -2,41 +2,36 @@
 """
 Extracts static information from every `ast.ClassDef` node.
 
-Signature now matches the call‑site:
-
-    analyse(file_path: Path, tree: ast.AST)
-
-so `CodeAnalyzer` can supply the already‑parsed AST and avoid
-double‑parsing overhead.
+Nodes arrive through `visit_ClassDef`, so `AnalyzerDispatcher` can feed
+this analyser from the same single walk it uses for all the others;
+`analyse(file_path, tree)` still works standalone.
 """
 from __future__ import annotations
 
 import ast
-from pathlib import Path
-from uuid import uuid4
 
-from pydiscovery.analyzer.base import Analyzer
+from pydiscovery.analyzer.base import Analyzer, line_range
 from pydiscovery.model.class_element import ClassElement
+from pydiscovery.model.code_element import element_id
 
 
 class ClassAnalyzer(Analyzer):
     """Collect class name, inheritance, ctor params, attributes, methods."""
 
+    tracks_scope = True
+
     # ------------------------------------------------------------------ #
-    def analyse(self, file_path: Path, tree: ast.AST) -> None:  # noqa: D401
-        """
-        Iterate over `ClassDef` nodes in *tree* and persist a `ClassElement`
-        for each.  *file_path* is kept for future use (e.g. diagnostics),
-        but parsing is **not** repeated here.
-        """
-        for node in (n for n in ast.walk(tree) if isinstance(n, ast.ClassDef)):
-            element = self._build_class_element(node)
-            self.repo.save(element)
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:  # noqa: N802
+        """Persist a `ClassElement` for *node*."""
+        elt = self._build_class_element(node, f"{self.scope.qualname}.{node.name}")  # type: ignore[union-attr]
+        self.repo.save(elt)
 
     # ------------------------------------------------------------------ #
     # helpers
-    def _build_class_element(self, node: ast.ClassDef) -> ClassElement:
-        elt = ClassElement(str(uuid4()), node.name)
+    def _build_class_element(self, node: ast.ClassDef, qualname: str) -> ClassElement:
+        elt = ClassElement(element_id("CLASS", qualname), node.name)
+        elt.qualname = qualname
+        elt.metadata["lines"] = line_range(node)
 
         # --- inheritance ------------------------------------------------
         for base in node.bases:
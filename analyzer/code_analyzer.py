@@ -8,17 +8,25 @@ CodeAnalyzer
 * Every file path embedded in the graph (`files`, `data_flows`,
   `external_dependencies[*].used_by`) is now **relative to that root**,
   saving tokens for LLM consumption.
+* `jobs > 1` spreads reading, parsing and per‑file analysis over a process
+  pool; results are merged in file order, so the graph is identical to a
+  serial run.
+* An optional `AnalysisCache` lets unchanged files skip reading/parsing
+  entirely; only cache misses are analysed (and sent to the pool).
+* `update()` re‑analyses changed / added files and forgets deleted ones in
+  place (elements, data flows, imports) – the basis of `--watch`.
 """
 from __future__ import annotations
 
 import ast
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, Iterator, List, Optional, Set
 
-from pydiscovery.analyzer.class_analyzer import ClassAnalyzer
-from pydiscovery.analyzer.function_analyzer import FunctionAnalyzer
-from pydiscovery.analyzer.data_flow_analyzer import DataFlowAnalyzer
+from pydiscovery.analyzer.analysis_cache import AnalysisCache
+from pydiscovery.analyzer.file_analysis import FileAnalysis, analyse_file, analyse_file_task, safe_parse
 from pydiscovery.analyzer.import_analyzer import ImportAnalyzer
 from pydiscovery.repository.code_element_repository import CodeElementRepository
 
@@ -29,32 +37,74 @@ class CodeAnalyzer:
     """Runs analysers and returns a compact, relative‑path knowledge‑graph."""
 
     # ------------------------------------------------------------------ #
-    def __init__(self, repository: CodeElementRepository) -> None:
+    def __init__(
+        self,
+        repository: CodeElementRepository,
+        jobs: int = 1,
+        cache: AnalysisCache | None = None,
+    ) -> None:
         self._repo = repository
-        # concrete analysers are created later when we know the project root
-        self._class_an: ClassAnalyzer | None = None
-        self._func_an: FunctionAnalyzer | None = None
+        # jobs <= 0 → one worker per CPU; 1 → analyse in‑process
+        self._jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+        self._cache = cache
+        # created later when we know the project root
         self._import_an: ImportAnalyzer | None = None
-        self._df_an = DataFlowAnalyzer()
 
         self._root: Path | None = None
+        self._files: Dict[str, None] = {}  # ordered set of analysed rel paths
+        self._digests: Dict[str, str] = {}  # rel path -> content hash
         self._data_flows: Dict[str, Dict[str, Set[str]]] = {}
 
     # ------------------------------------------------------------------ #
-    def analyse_path(self, root: Path) -> Dict[str, object]:
+    def analyse_path(self, root: Path, lazy: bool = False) -> Dict[str, object]:
+        """
+        Analyse every `*.py` below *root*.  With *lazy*, `"elements"` is a
+        generator converting elements on demand – meant for the streaming
+        `KnowledgeGraphFileHandler.save()`, which never holds them all as dicts.
+        """
         self._root = root.resolve()
-        self._class_an = ClassAnalyzer(self._repo)
-        self._func_an = FunctionAnalyzer(self._repo)
         self._import_an = ImportAnalyzer(self._root)
 
-        files: List[str] = []
-        for py in self._root.rglob("*.py"):
-            files.append(self._rel(py))
-            self._analyse_file(py)
-
+        paths = list(self._root.rglob("*.py"))
+        self._files = dict.fromkeys(self._rel(py) for py in paths)
+        for result in self._analyse_files(paths):
+            if result is not None:
+                self._merge(result)
+        return self.graph(lazy)
+
+    def update(self, changed: List[Path], removed: List[str]) -> List[str]:
+        """
+        Bring the repository up to date after *changed* (absolute paths,
+        modified or new) and *removed* (root‑relative) files, without touching
+        any other file.  Returns the relative paths whose analysis changed –
+        files rewritten with identical content are skipped.
+        """
+        touched: List[str] = []
+        for rel in removed:
+            if rel in self._files:
+                del self._files[rel]
+                self._forget(rel)
+                touched.append(rel)
+        for py, result in zip(changed, self._run(changed)):
+            rel = self._rel(py)
+            if rel in self._files and result is not None and self._digests.get(rel) == result.digest:
+                continue
+            self._files.setdefault(rel)
+            self._forget(rel)
+            if result is not None:
+                self._merge(result)
+            touched.append(rel)
+        return touched
+
+    def graph(self, lazy: bool = False) -> Dict[str, object]:
+        """The knowledge graph for the current repository state."""
         graph: Dict[str, object] = {
-            "files": files,
-            "elements": [elt.to_dict() for elt in self._repo.all_elements()],
+            "files": list(self._files),
+            "elements": (
+                (elt.to_dict() for elt in self._repo.all_elements())
+                if lazy
+                else [elt.to_dict() for elt in self._repo.all_elements()]
+            ),
             "data_flows": self._data_flows,
             "external_dependencies": self._import_an.external_dependencies(),  # type: ignore[union-attr]
         }
@@ -62,26 +112,60 @@ class CodeAnalyzer:
 
     # ------------------------------------------------------------------ #
     # helpers
-    def _analyse_file(self, path: Path) -> None:
-        tree = self._safe_parse(path)
-        if tree is None or self._class_an is None or self._func_an is None or self._import_an is None:
+    def _analyse_files(self, paths: List[Path]) -> List[Optional[FileAnalysis]]:
+        """Return one result per path, **in input order**; cache hits are reused."""
+        results: List[Optional[FileAnalysis]] = [None] * len(paths)
+        pending: List[int] = []
+        for i, py in enumerate(paths):
+            hit = self._cache.lookup(py, self._rel(py)) if self._cache else None
+            if hit is None:
+                pending.append(i)
+            else:
+                results[i] = hit
+
+        for i, result in zip(pending, self._run([paths[i] for i in pending])):
+            results[i] = result
+            if result is not None and self._cache is not None:
+                self._cache.store(result)
+
+        if self._cache is not None:
+            LOG.info("Analysis cache: %d hit(s), %d miss(es)", self._cache.hits, self._cache.misses)
+            self._cache.save()
+        return results
+
+    def _run(self, paths: List[Path]) -> Iterator[Optional[FileAnalysis]]:
+        """Analyse *paths* in order, serially or on a process pool."""
+        if self._jobs == 1 or len(paths) < 2:
+            for py in paths:
+                yield analyse_file(py, self._root)  # type: ignore[arg-type]
             return
 
-        self._class_an.analyse(path, tree)
-        self._func_an.analyse(path, tree)
-        self._import_an.analyse(path, tree)
-
-        flows = self._df_an.analyse(tree)
-        if flows:
-            self._data_flows[self._rel_str(path)] = flows
+        workers = min(self._jobs, len(paths))
+        # a few chunks per worker keeps IPC low while still balancing load
+        chunksize = max(1, len(paths) // (workers * 4))
+        tasks = [(str(py), str(self._root)) for py in paths]
+        LOG.debug("Analysing %d files with %d workers", len(paths), workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(analyse_file_task, tasks, chunksize=chunksize)
+
+    def _merge(self, result: FileAnalysis) -> None:
+        for elt in result.elements:
+            self._repo.save(elt)
+        self._import_an.record_file(result.rel, result.imports)  # type: ignore[union-attr]
+        if result.data_flows:
+            self._data_flows[result.rel] = result.data_flows
+        self._digests[result.rel] = result.digest
+
+    def _forget(self, rel: str) -> None:
+        for elt in self._repo.find_by_file(rel):
+            self._repo.delete(elt.qualname)
+        self._import_an.forget_file(rel)  # type: ignore[union-attr]
+        self._data_flows.pop(rel, None)
+        self._digests.pop(rel, None)
 
     @staticmethod
     def _safe_parse(path: Path) -> ast.AST | None:
-        try:
-            return ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
-        except (SyntaxError, UnicodeDecodeError) as err:
-            LOG.debug("Skip %s – %s", path, err)
-            return None
+        return safe_parse(path)
 
     # ------------------------------------------------------------------ #
     def _rel(self, p: Path) -> str:
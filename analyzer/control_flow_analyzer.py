@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import ast
 from pathlib import Path
-from typing import Dict, List
+from typing import List
 
 from pydiscovery.analyzer.base import Analyzer
 
@@ -13,12 +13,17 @@ class ControlFlowAnalyzer(Analyzer):
     (If / For / While / Try) in each module.
     """
 
-    def analyse(self, file_path: Path, tree: ast.AST) -> None:
-        structures: List[str] = []
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.If, ast.For, ast.While, ast.Try)):
-                structures.append(type(node).__name__)
-        if structures:
+    def begin_file(self, file_path: Path, tree: ast.AST) -> None:
+        self._structures: List[str] = []
+
+    def visit_If(self, node: ast.AST) -> None:  # noqa: N802
+        self._structures.append(type(node).__name__)
+
+    visit_For = visit_While = visit_Try = visit_If
+
+    def end_file(self, file_path: Path, tree: ast.AST) -> None:
+        if self._structures:
             mod = self.repo.find_by_name(file_path.stem)
             if mod:
-                mod.metadata["control_structures"] = structures
+                mod.metadata["control_structures"] = self._structures
+                self.repo.save(mod)
@@ -1,24 +1,34 @@
 from __future__ import annotations
 
 import ast
+from pathlib import Path
 from typing import Dict, Set
 
+from pydiscovery.analyzer.base import AnalysisPass, AnalyzerDispatcher
 
-class DataFlowAnalyzer:
+
+class DataFlowAnalyzer(AnalysisPass):
     """
     Builds a very lightweight variable assignment dependency graph
     for a single AST (file).
     """
 
+    def __init__(self) -> None:
+        self.flows: Dict[str, Set[str]] = {}
+
     # -----------------------------------------------------------------
     def analyse(self, node: ast.AST) -> Dict[str, Set[str]]:
-        assigns: Dict[str, Set[str]] = {}
-        for n in ast.walk(node):
-            if isinstance(n, ast.Assign):
-                # left‑hand targets
-                targets = [t.id for t in n.targets if isinstance(t, ast.Name)]
-                # RHS dependencies (all Name nodes inside the value)
-                deps = {d.id for d in ast.walk(n.value) if isinstance(d, ast.Name)}
-                for t in targets:
-                    assigns.setdefault(t, set()).update(deps)
-        return assigns
+        AnalyzerDispatcher([self]).run(Path(), node)
+        return self.flows
+
+    # single‑pass hooks -------------------------------------------------
+    def begin_file(self, file_path: Path, tree: ast.AST) -> None:
+        self.flows = {}
+
+    def visit_Assign(self, n: ast.Assign) -> None:  # noqa: N802
+        # left‑hand targets
+        targets = [t.id for t in n.targets if isinstance(t, ast.Name)]
+        # RHS dependencies (all Name nodes inside the value)
+        deps = {d.id for d in ast.walk(n.value) if isinstance(d, ast.Name)}
+        for t in targets:
+            self.flows.setdefault(t, set()).update(deps)
@@ -8,9 +8,12 @@ from pydiscovery.model.class_element import ClassElement
 
 
 class DynamicAttrAnalyzer(Analyzer):
-    def analyse(self, file_path: Path, tree: ast.AST) -> None:
-        for call in (c for c in ast.walk(tree) if isinstance(c, ast.Call)):
-            if isinstance(call.func, ast.Name) and call.func.id in {"setattr", "getattr"}:
-                cls = self.repo.find_by_name(file_path.stem)
-                if isinstance(cls, ClassElement):
-                    cls.metadata["dynamic_attrs"] = True
+    def begin_file(self, file_path: Path, tree: ast.AST) -> None:
+        self._file = file_path
+
+    def visit_Call(self, call: ast.Call) -> None:  # noqa: N802
+        if isinstance(call.func, ast.Name) and call.func.id in {"setattr", "getattr"}:
+            cls = self.repo.find_by_name(self._file.stem)
+            if isinstance(cls, ClassElement):
+                cls.metadata["dynamic_attrs"] = True
+                self.repo.save(cls)
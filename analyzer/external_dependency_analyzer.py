@@ -39,14 +39,16 @@ class ExternalDependencyAnalyzer(Analyzer):
         self._usage: Dict[str, Set[Path]] = {}
 
     # -----------------------------------------------------------------
-    def analyse(self, file_path: Path, tree: ast.AST) -> None:  # noqa: D401
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    self._record(alias.name.split(".")[0], file_path)
-            elif isinstance(node, ast.ImportFrom):
-                if node.level == 0 and node.module:
-                    self._record(node.module.split(".")[0], file_path)
+    def begin_file(self, file_path: Path, tree: ast.AST) -> None:
+        self._file = file_path
+
+    def visit_Import(self, node: ast.Import) -> None:  # noqa: N802
+        for alias in node.names:
+            self._record(alias.name.split(".")[0], self._file)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:  # noqa: N802
+        if node.level == 0 and node.module:
+            self._record(node.module.split(".")[0], self._file)
 
     def finalize(self, project_root: Path) -> None:  # noqa: D401
         self._root = project_root.resolve()
@@ -0,0 +1,123 @@
+# pydiscovery/analyzer/file_analysis.py
+"""
+Per‑file analysis unit shared by the serial and the parallel code paths.
+
+`analyse_file()` reads, parses and runs the core analysers on a single file
+and returns a compact, picklable `FileAnalysis`.  `CodeAnalyzer` merges those
+results into the real repository **in file order**, so a run spread over a
+process pool yields exactly the same graph as a single‑core run.
+"""
+from __future__ import annotations
+
+import ast
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from pydiscovery.analyzer.base import AnalyzerDispatcher
+from pydiscovery.analyzer.class_analyzer import ClassAnalyzer
+from pydiscovery.analyzer.data_flow_analyzer import DataFlowAnalyzer
+from pydiscovery.analyzer.function_analyzer import FunctionAnalyzer
+from pydiscovery.analyzer.import_analyzer import ImportAnalyzer
+from pydiscovery.model.code_element import CodeElement
+from pydiscovery.repository.code_element_repository import CodeElementRepository
+
+LOG = logging.getLogger(__name__)
+
+# Bump whenever an analyser changes what it records – invalidates on‑disk caches.
+ANALYZER_VERSION = 7
+
+
+class FileAnalysis:
+    """Everything the core analysers learnt about one file."""
+
+    __slots__ = ("rel", "digest", "elements", "data_flows", "imports")
+
+    def __init__(
+        self,
+        rel: str,
+        digest: str,
+        elements: List[CodeElement],
+        data_flows: Dict[str, Set[str]],
+        imports: List[str],
+    ) -> None:
+        self.rel = rel                    # path relative to the project root
+        self.digest = digest              # content hash of the source bytes
+        self.elements = elements          # in the order they were saved
+        self.data_flows = data_flows
+        self.imports = imports            # top‑level imported package names
+
+
+class _ElementCollector(CodeElementRepository):
+    """Records `save()` calls in order so they can be replayed by the parent."""
+
+    def __init__(self) -> None:
+        self.saved: List[CodeElement] = []
+        self._by_name: Dict[str, CodeElement] = {}
+
+    def save(self, element: CodeElement) -> None:
+        self.saved.append(element)
+        self._by_name[element.name] = element
+
+    def find_by_name(self, name: str) -> Optional[CodeElement]:
+        return self._by_name.get(name)
+
+    def all_elements(self) -> Iterable[CodeElement]:
+        return self._by_name.values()
+
+
+# ---------------------------------------------------------------------- #
+def module_name(rel: str) -> str:
+    """Dotted module name for a root‑relative path: `pkg/mod.py` → `pkg.mod`."""
+    parts = rel[: -len(".py")].split("/") if rel.endswith(".py") else rel.split("/")
+    if len(parts) > 1 and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def safe_parse(path: Path, data: bytes | None = None) -> ast.AST | None:
+    try:
+        if data is None:
+            data = path.read_bytes()
+        return ast.parse(data.decode("utf-8"), filename=str(path))
+    except (SyntaxError, UnicodeDecodeError) as err:
+        LOG.debug("Skip %s – %s", path, err)
+        return None
+
+
+def analyse_file(path: Path, root: Path) -> Optional[FileAnalysis]:
+    """Analyse *path*; returns None when the file cannot be parsed."""
+    data = path.read_bytes()
+    tree = safe_parse(path, data)
+    if tree is None:
+        return None
+
+    collector = _ElementCollector()
+    imports = ImportAnalyzer(root)
+    flows = DataFlowAnalyzer()
+    rel = path.relative_to(root).as_posix()
+    # one walk of the tree feeds all core analysers
+    AnalyzerDispatcher([ClassAnalyzer(collector), FunctionAnalyzer(collector), imports, flows]).run(
+        path, tree, module=module_name(rel)
+    )
+    for elt in collector.saved:
+        elt.file = rel
+
+    return FileAnalysis(
+        rel=rel,
+        digest=content_digest(data),
+        elements=collector.saved,
+        data_flows=flows.flows,
+        imports=imports.file_imports,
+    )
+
+
+def analyse_file_task(args: tuple[str, str]) -> Optional[FileAnalysis]:
+    """Process‑pool entry point – takes plain strings to keep pickling cheap."""
+    path, root = args
+    return analyse_file(Path(path), Path(root))
@@ -3,37 +3,60 @@ from __future__ import annotations
 import ast
 import logging
 from pathlib import Path
-from uuid import uuid4
+from typing import Dict
 
-from pydiscovery.analyzer.base import Analyzer
+from pydiscovery.analyzer.base import Analyzer, line_range
+from pydiscovery.model.code_element import element_id
 from pydiscovery.model.function_element import FunctionElement
 
 LOG = logging.getLogger(__name__)
 
 
 class FunctionAnalyzer(Analyzer):
-    """Top‑level function discovery with decorators & typing."""
+    """
+    Function, method and nested‑function discovery with decorators & typing.
 
-    def analyse(self, file_path: Path, tree: ast.AST) -> None:
-        for node in (n for n in ast.walk(tree) if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))):
-            # skip methods (have ClassDef parent)
-            if any(isinstance(p, ast.ClassDef) for p in ast.walk(node) if p is not node):
-                continue
-            elt = self._build_function_element(node)
-            self.repo.save(elt)
+    Relies on the dispatcher's scope tracking, so telling a method from a
+    nested or top‑level function is O(1) and every call is credited to its
+    innermost enclosing function – the whole file is walked exactly once.
+    """
+
+    tracks_scope = True
+
+    def begin_file(self, file_path: Path, tree: ast.AST) -> None:
+        self._open: Dict[ast.AST, FunctionElement] = {}  # def node -> element
+
+    def visit_FunctionDef(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:  # noqa: N802
+        scope = self.scope
+        qualname = f"{scope.qualname}.{node.name}"  # type: ignore[union-attr]
+        elt = self._build_function_element(node, qualname)
+        if scope.kind == "class":  # type: ignore[union-attr]
+            elt.metadata["scope"] = "method"
+        elif scope.kind == "function":  # type: ignore[union-attr]
+            elt.metadata["scope"] = "nested"
+        self._open[node] = elt
+        self.repo.save(elt)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Call(self, call: ast.Call) -> None:  # noqa: N802
+        if isinstance(call.func, ast.Name):
+            elt = self._open.get(self.scope.node)  # type: ignore[union-attr]
+            if elt is not None:
+                elt.add_dependency(call.func.id)
 
     # ------------------------------------------------------------------
-    def _build_function_element(self, node: ast.FunctionDef) -> FunctionElement:
-        elt = FunctionElement(str(uuid4()), node.name)
+    def _build_function_element(self, node: ast.FunctionDef, qualname: str) -> FunctionElement:
+        # the module‑qualified name already pins the file: no need to hash it
+        elt = FunctionElement(element_id("FUNCTION", qualname), node.name)
+        elt.qualname = qualname
+        elt.metadata["lines"] = line_range(node)
         for arg in node.args.args:
             elt.add_parameter(arg.arg)
             if arg.annotation and isinstance(arg.annotation, ast.Name):
                 elt.metadata.setdefault("param_types", {})[arg.arg] = arg.annotation.id
         if node.returns and isinstance(node.returns, ast.Name):
             elt.metadata["return_type"] = node.returns.id
-        for call in (n for n in ast.walk(node) if isinstance(n, ast.Call)):
-            if isinstance(call.func, ast.Name):
-                elt.add_dependency(call.func.id)
         for deco in node.decorator_list:
             if isinstance(deco, ast.Name):
                 elt.add_dependency(deco.id)
@@ -16,7 +16,7 @@ import ast
 import sys
 from importlib import metadata
 from pathlib import Path
-from typing import Dict, Set
+from typing import Dict, Iterable, List, Set
 
 from pydiscovery.analyzer.base import Analyzer
 
@@ -29,21 +29,42 @@ class ImportAnalyzer(Analyzer):
         # This analyser does not create CodeElement objects
         super().__init__(None)  # type: ignore[arg-type]
         self._root = project_root.resolve()
-        self._internal: Set[str] = self._discover_internal_packages()
+        self._internal: Set[str] | None = None  # discovered on first record
         self._pkg_to_files: Dict[str, Set[str]] = {}
+        self._versions: Dict[str, str | None] = {}
+        self.file_imports: List[str] = []  # names seen in the current file
 
     # ------------------------------------------------------------------ #
     # API consumed by CodeAnalyzer
     def analyse(self, file_path: Path, tree: ast.AST) -> None:
         """Record top‑level import names for a single file."""
-        rel = file_path.relative_to(self._root).as_posix()
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    self._record(alias.name.split(".")[0], rel)
-            elif isinstance(node, ast.ImportFrom):
-                if node.level == 0 and node.module:
-                    self._record(node.module.split(".")[0], rel)
+        super().analyse(file_path, tree)
+        self.record_file(file_path.relative_to(self._root).as_posix(), self.file_imports)
+
+    def record_file(self, rel_file: str, packages: Iterable[str]) -> None:
+        """Record pre‑extracted package names (e.g. from a worker process)."""
+        for name in packages:
+            self._record(name, rel_file)
+
+    def forget_file(self, rel_file: str) -> None:
+        """Drop everything recorded for *rel_file* (changed or deleted file)."""
+        for pkg in [p for p, files in self._pkg_to_files.items() if rel_file in files]:
+            files = self._pkg_to_files[pkg]
+            files.discard(rel_file)
+            if not files:
+                del self._pkg_to_files[pkg]
+
+    # single‑pass hooks: collect absolute import names in walk order
+    def begin_file(self, file_path: Path, tree: ast.AST) -> None:
+        self.file_imports = []
+
+    def visit_Import(self, node: ast.Import) -> None:  # noqa: N802
+        for alias in node.names:
+            self.file_imports.append(alias.name.split(".")[0])
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:  # noqa: N802
+        if node.level == 0 and node.module:
+            self.file_imports.append(node.module.split(".")[0])
 
     def external_dependencies(self) -> list[dict]:
         """Return list sorted by package name."""
@@ -52,7 +73,7 @@ class ImportAnalyzer(Analyzer):
             out.append(
                 {
                     "package": pkg,
-                    "version": self._resolve_version(pkg),
+                    "version": self._version(pkg),
                     "used_by": sorted(files),
                 }
             )
@@ -61,6 +82,8 @@ class ImportAnalyzer(Analyzer):
     # ------------------------------------------------------------------ #
     # helpers
     def _record(self, name: str, rel_file: str) -> None:
+        if self._internal is None:
+            self._internal = self._discover_internal_packages()
         if name in _STD_LIB or name in self._internal or name == "":
             return
         self._pkg_to_files.setdefault(name, set()).add(rel_file)
@@ -73,6 +96,12 @@ class ImportAnalyzer(Analyzer):
                 pkgs.add(child.name)
         return pkgs
 
+    def _version(self, pkg: str) -> str | None:
+        # metadata lookups scan sys.path – resolve each package once
+        if pkg not in self._versions:
+            self._versions[pkg] = self._resolve_version(pkg)
+        return self._versions[pkg]
+
     @staticmethod
     def _resolve_version(pkg: str) -> str | None:
         try:
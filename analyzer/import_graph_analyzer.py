@@ -5,6 +5,7 @@ import sys
 from pathlib import Path
 
 from pydiscovery.analyzer.base import Analyzer
+from pydiscovery.model.code_element import CodeElement
 from pydiscovery.model.module_element import ModuleElement
 
 
@@ -16,21 +17,26 @@ class ImportGraphAnalyzer(Analyzer):
         self._root: Path | None = None
 
     # ------------------------------------------------------------------
-    def analyse(self, file_path: Path, tree: ast.AST) -> None:
+    def begin_file(self, file_path: Path, tree: ast.AST) -> None:
         mod_name = self._module_name(file_path)
-        if mod_name is None:
-            return
-        module_elt = self.repo.find_by_name(mod_name) or ModuleElement(
-            element_id=mod_name, name=mod_name, file=str(file_path)
-        )
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    module_elt.add_dependency(alias.name)
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    module_elt.add_dependency(node.module)
-        self.repo.save(module_elt)
+        self._module_elt: CodeElement | None = None
+        if mod_name is not None:
+            self._module_elt = self.repo.find_by_name(mod_name) or ModuleElement(
+                element_id=mod_name, name=mod_name, file=str(file_path)
+            )
+
+    def visit_Import(self, node: ast.Import) -> None:  # noqa: N802
+        if self._module_elt is not None:
+            for alias in node.names:
+                self._module_elt.add_dependency(alias.name)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:  # noqa: N802
+        if self._module_elt is not None and node.module:
+            self._module_elt.add_dependency(node.module)
+
+    def end_file(self, file_path: Path, tree: ast.AST) -> None:
+        if self._module_elt is not None:
+            self.repo.save(self._module_elt)
 
     # helpers -----------------------------------------------------------
     def _module_name(self, path: Path) -> str | None:
@@ -10,11 +10,15 @@ from pydiscovery.model.module_element import ModuleElement
 class MetaProgrammingAnalyzer(Analyzer):
     META_FUNCS = {"exec", "eval", "type", "compile", "import_module"}
 
-    def analyse(self, file_path: Path, tree: ast.AST) -> None:
+    def begin_file(self, file_path: Path, tree: ast.AST) -> None:
         mod_elt = self.repo.find_by_name(file_path.stem)
         if not isinstance(mod_elt, ModuleElement):
             mod_elt = ModuleElement(file_path.stem, file_path.stem, str(file_path))
-        for call in (c for c in ast.walk(tree) if isinstance(c, ast.Call) and isinstance(c.func, ast.Name)):
-            if call.func.id in self.META_FUNCS:
-                mod_elt.metadata["dynamic_code"] = True
-        self.repo.save(mod_elt)
+        self._mod_elt = mod_elt
+
+    def visit_Call(self, call: ast.Call) -> None:  # noqa: N802
+        if isinstance(call.func, ast.Name) and call.func.id in self.META_FUNCS:
+            self._mod_elt.metadata["dynamic_code"] = True
+
+    def end_file(self, file_path: Path, tree: ast.AST) -> None:
+        self.repo.save(self._mod_elt)
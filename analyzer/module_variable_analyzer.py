@@ -2,16 +2,17 @@ from __future__ import annotations
 
 import ast
 from pathlib import Path
-from uuid import uuid4
 
 from pydiscovery.analyzer.base import Analyzer
+from pydiscovery.model.code_element import element_id
 from pydiscovery.model.variable_element import VariableElement
 
 
 class ModuleVariableAnalyzer(Analyzer):
-    def analyse(self, file_path: Path, tree: ast.AST) -> None:
-        for node in (n for n in tree.body if isinstance(n, ast.Assign)):
+    # only the module body matters – no per‑node callbacks needed
+    def begin_file(self, file_path: Path, tree: ast.AST) -> None:
+        for node in (n for n in getattr(tree, "body", ()) if isinstance(n, ast.Assign)):
             for target in node.targets:
                 if isinstance(target, ast.Name):
-                    var = VariableElement(str(uuid4()), target.id)
+                    var = VariableElement(element_id("VARIABLE", target.id, self.module), target.id)
                     self.repo.save(var)
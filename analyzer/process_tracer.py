@@ -0,0 +1,186 @@
+# pydiscovery/analyzer/process_tracer.py
+"""
+Trace a program *and* the Python processes it starts.  Usage:
+
+>>> from pydiscovery.analyzer.process_tracer import ProcessTracer
+>>> with ProcessTracer("traces/", include=["path/to/project"]) as tracer:
+...     run_pipeline()            # multiprocessing, ProcessPoolExecutor, …
+>>> edges = tracer.merge()       # {"processes": {pid: calls}, …} per edge
+
+Every process – this one and each descendant – runs its own monitor
+(`RuntimeMonitor`, or `SamplingMonitor` when *hz* is given) streaming to
+its own `TraceSink` file, ``<directory>/runtime_calls.<pid>.ndjson``;
+`merge()` folds them into one edge table with per‑process attribution.
+Children are reached two ways:
+
+* **fork** – an `os.register_at_fork` hook drops the monitor the child
+  inherited (its data belongs to the parent) and starts a fresh one.
+  `multiprocessing` children leave through `os._exit`, so the final flush
+  is also registered as a `multiprocessing.util.Finalize`.
+* **fresh interpreters** – spawn / forkserver workers and
+  ``subprocess.run([sys.executable, …])``.  The configuration travels in
+  the ``PYDISCOVERY_TRACE`` environment variable and a `sitecustomize`
+  bootstrap put first on ``PYTHONPATH`` starts tracing before the child's
+  own code runs (chaining to any existing `sitecustomize`).  Children
+  started with a scrubbed environment, ``-I`` or ``-S`` stay untraced.
+
+Partial files survive a crashed child; whatever it flushed is merged.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from pydiscovery.analyzer.trace_sink import TraceSink, merge_stack_trace, merge_trace
+
+ENV_VAR = "PYDISCOVERY_TRACE"
+BOOTSTRAP_DIR = Path(os.path.abspath(__file__)).parent / "_child_bootstrap"  # keep symlinked paths
+PARTIAL_GLOB = "runtime_calls.*.ndjson"
+
+# the monitor tracing *this* process, with the configuration it came from
+_current: Optional[Any] = None
+_config: Optional[Dict[str, Any]] = None
+
+
+class ProcessTracer:
+    def __init__(
+        self,
+        directory: Path | str,
+        include: Iterable[Path | str] | None = None,
+        exclude: Iterable[Path | str] | None = None,
+        thread_ids: bool = False,
+        hz: float | None = None,
+        flush: float = 10.0,
+        stacks: bool = False,
+    ) -> None:
+        self.directory = Path(directory).resolve()
+        self.config: Dict[str, Any] = {
+            "directory": str(self.directory),
+            # children may run from another cwd: pin relative paths now
+            "include": [_absolute(p) for p in include] if include else None,
+            "exclude": [_absolute(p) for p in exclude] if exclude else None,
+            "thread_ids": thread_ids,
+            "hz": hz,
+            "flush": flush,
+            "stacks": stacks,
+        }
+        self.edges: Dict[tuple, Dict[str, Any]] = {}
+        self.stacks: Dict[tuple, Dict[str, Any]] = {}
+        self.thread_names: Dict[int, str] = {}
+        self._saved_env: Dict[str, Optional[str]] = {}
+
+    # context‑manager ---------------------------------------------------
+    def __enter__(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for stale in self.directory.glob(PARTIAL_GLOB):
+            stale.unlink()  # sinks append
+        self._saved_env = {key: os.environ.get(key) for key in (ENV_VAR, "PYTHONPATH")}
+        os.environ[ENV_VAR] = json.dumps(self.config)
+        path = os.environ.get("PYTHONPATH")
+        os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BOOTSTRAP_DIR), path]))
+        start(self.config)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        monitor = _current
+        stop()
+        if monitor is not None:
+            self.thread_names = monitor.thread_names
+        for key, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    # results -----------------------------------------------------------
+    def partials(self) -> List[Path]:
+        """The per‑process trace files written so far."""
+        return sorted(self.directory.glob(PARTIAL_GLOB))
+
+    def merge(self) -> Dict[tuple, Dict[str, Any]]:
+        """Fold every process's partial trace into `edges` (and `stacks`) and return the edges."""
+        partials = self.partials()
+        self.edges = merge_trace(partials, by_process=True)
+        if self.config["stacks"]:
+            self.stacks = merge_stack_trace(partials)
+        return self.edges
+
+
+# ---------------------------------------------------------------------------
+# per‑process lifecycle
+# ---------------------------------------------------------------------------
+def start(config: Dict[str, Any]) -> None:
+    """Start tracing this process into its partial file under *config*."""
+    global _current, _config
+    from pydiscovery.analyzer.runtime_monitor import RuntimeMonitor
+    from pydiscovery.analyzer.sampling_monitor import SamplingMonitor
+
+    sink = TraceSink(Path(config["directory"]) / f"runtime_calls.{os.getpid()}.ndjson", interval=config["flush"])
+    filters = dict(
+        include=config["include"], exclude=config["exclude"], thread_ids=config["thread_ids"],
+        sink=sink, stacks=config.get("stacks", False),
+    )
+    if config["hz"]:
+        monitor = SamplingMonitor(hz=config["hz"], **filters)
+    else:
+        monitor = RuntimeMonitor(**filters)
+    _config = config
+    _current = monitor.__enter__()
+
+
+def stop() -> None:
+    """Stop tracing this process and write its final delta (idempotent)."""
+    global _current
+    monitor, _current = _current, None
+    if monitor is not None:
+        monitor.__exit__(None, None, None)
+
+
+def bootstrap() -> None:
+    """Entry point of the `sitecustomize` shim in fresh child interpreters."""
+    raw = os.environ.get(ENV_VAR)
+    if not raw or _current is not None:
+        return
+    try:
+        config = json.loads(raw)
+        start(config)
+    except Exception as e:  # never keep the child from running
+        print(f"[pydiscovery] child tracing disabled: {type(e).__name__}: {e}", file=sys.stderr)
+        return
+    atexit.register(stop)
+
+
+def _after_fork_in_child() -> None:
+    global _current
+    if _current is None:
+        return
+    _current.abandon()
+    _current = None
+    start(_config)
+    atexit.register(stop)  # os.fork() children that exit normally
+    mp_util = sys.modules.get("multiprocessing.util")
+    if mp_util is not None:
+        # Process._bootstrap clears the finalizer registry after fork and
+        # then runs the after‑fork callbacks: register from one of those
+        mp_util.register_after_fork(_after_fork_in_child, _register_finalizer)
+
+
+def _register_finalizer(_obj: object) -> None:
+    import multiprocessing.util as mp_util
+
+    mp_util.Finalize(None, stop, exitpriority=100)
+
+
+def _absolute(path: Path | str) -> str:
+    text = str(path)
+    if any(ch in text for ch in "*?["):
+        return text if text.startswith("*") else os.path.realpath(text)  # as CodeFilter reads globs
+    return str(Path(text).resolve())
+
+
+if hasattr(os, "register_at_fork"):  # POSIX only; Windows has spawn alone
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -1,51 +1,482 @@
 # pydiscovery/analyzer/runtime_monitor.py
 """
-Minimal runtime monitor that records caller→callee edges and call counts
-using `sys.setprofile`.  Usage:
+Minimal runtime monitor that records caller→callee edges with call counts
+and timings.  Usage:
 
 >>> from pydiscovery.analyzer.runtime_monitor import RuntimeMonitor
->>> with RuntimeMonitor() as mon:
+>>> with RuntimeMonitor(root="path/to/project") as mon:
 ...     your_function()
 >>> print(mon.edges)
+
+`edges` maps ``(caller, callee)`` – ``"file:line:function"`` frame names,
+*line* being the code's first line (see `parse_frame`) – to::
+
+    {"calls": 12, "inclusive_ns": …, "exclusive_ns": …,
+     "min_ns": …, "max_ns": …, "mean_ns": …}
+
+Times come from a per‑thread shadow stack fed by call / return events and
+`time.perf_counter_ns`.  Every thread accumulates into its own table – no
+lock on the hot path – and the tables are merged on exit, or flushed as
+deltas to a `TraceSink` while tracing (``sink=…``; `edges` then stays
+empty, see `merge_trace()`).  Threads started
+while the monitor is active are traced too; with ``thread_ids=True`` each
+edge also gets ``"threads": {thread ident: calls}`` (names in
+`thread_names`).  *Inclusive* time covers the callee and everything
+it called; *exclusive* time leaves out the traced callees (time spent in
+untraced or C code stays with the caller).  min / max / mean are inclusive
+per call.  A generator or coroutine is timed per resumption, each
+resumption counting as a call, as `sys.setprofile` reports them.
+
+With ``stacks=True`` the monitor also keeps full call paths for flame
+graphs: each open call carries a stack id interned per thread as
+``(parent stack id, code)``, and returning credits its exclusive (self)
+time to that id.  `stacks` maps the path – frame names,
+outermost traced call first – to ``{"calls": …, "self_ns": …}``; see
+`stack_export` for collapsed‑stack and speedscope output.
+
+Backends
+--------
+* ``"monitoring"`` – PEP 669 `sys.monitoring` (Python 3.12+).  Only Python
+  start / resume / return / yield / unwind events are requested, and code
+  objects outside *root* answer `DISABLE`, so the interpreter stops
+  reporting them after their first call.
+* ``"setprofile"`` – `sys.setprofile`, used on older interpreters or when
+  the profiler tool id is taken.  It still sees every call / return / C
+  event, so it stays several times slower.
+
+``backend="auto"`` (the default) picks the first available.  Either way the
+hot path works on code objects; the names in `edges` are built once, on
+exit.
+
+Filtering
+---------
+*include* / *exclude* take directories, files or glob patterns (*root* is
+shorthand for one include).  A code object is traced when its file matches
+some include (or none are given) and no exclude.  `CodeFilter` decides once
+per code object, so a repeat call costs one dict lookup – and under
+`sys.monitoring` excluded code is not reported at all after its first call.
 """
 from __future__ import annotations
 
+import fnmatch
+import os
+import re
 import sys
 import threading
-from types import FrameType
-from typing import Dict, Tuple
+import time
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pydiscovery.analyzer.trace_sink import TraceSink, merge_stacks, merge_stats
 
 CallEdge = Tuple[str, str]  # (caller, callee)
+EdgeStats = Dict[str, int]  # calls, inclusive_ns, exclusive_ns, min_ns, max_ns, mean_ns
+StackPath = Tuple[str, ...]  # frame names, outermost traced call first
+StackStats = Dict[str, int]  # calls, self_ns
+
+ROOT_CALLER = "<root>"
+_HAS_MONITORING = hasattr(sys, "monitoring")
+
+# raw per‑edge accumulator: [calls, inclusive, exclusive, min, max]
+_CALLS, _INCL, _EXCL, _MIN, _MAX = range(5)
+
+
+def parse_frame(name: str) -> Tuple[str, Optional[int], str]:
+    """
+    Split a frame name into ``(file, first line, function)``.  Names written
+    before line numbers were recorded (``"file:function"``) give ``None``.
+    """
+    rest, _, func = name.rpartition(":")
+    file, _, line = rest.rpartition(":")  # rpartition keeps "C:\\…" drive letters
+    if line.isdigit() and file:
+        return file, int(line), func
+    return rest, None, func
+
+
+class CodeFilter:
+    """
+    Precompiled include / exclude lists: directory prefixes and exact files
+    go into one `str.startswith` tuple, glob patterns into one regex.
+    """
+
+    def __init__(
+        self,
+        include: Iterable[Path | str] | None = None,
+        exclude: Iterable[Path | str] | None = None,
+    ) -> None:
+        self.include = self._compile(include or ())
+        self.exclude = self._compile(exclude or ())
+        self.skip: Dict[CodeType, bool] = {}  # code object -> excluded?
+
+    def excluded(self, code: CodeType) -> bool:
+        """Decide (once per code object) whether *code* is filtered out."""
+        out = self.skip[code] = not self.traces(code.co_filename)
+        return out
+
+    def traces(self, filename: str) -> bool:
+        # pseudo files ("<frozen …>", "<string>") are matched verbatim; real
+        # ones symlink‑resolved like the entries (once per code object)
+        path = filename if filename.startswith("<") else os.path.realpath(filename)
+        if (self.include[0] or self.include[1]) and not self._matches(self.include, path):
+            return False
+        return not self._matches(self.exclude, path)
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _matches(compiled: tuple, path: str) -> bool:
+        prefixes, pattern = compiled
+        return path.startswith(prefixes) or (pattern is not None and pattern.match(path) is not None)
+
+    @staticmethod
+    def _compile(entries: Iterable[Path | str]) -> tuple:
+        prefixes: List[str] = []
+        globs: List[str] = []
+        for entry in entries:
+            entry = str(entry)
+            if any(ch in entry for ch in "*?["):
+                globs.append(fnmatch.translate(entry if entry.startswith("*") else os.path.realpath(entry)))
+                continue
+            resolved = Path(entry).expanduser().resolve()
+            prefixes.append(str(resolved) if resolved.is_file() else os.path.join(str(resolved), ""))
+        pattern = re.compile("|".join(globs)) if globs else None
+        return tuple(prefixes), pattern
+
+
+def _leave(state: list, code: CodeType, now: int) -> None:
+    """Close the innermost activation of *code* in a thread's (stack, stats, …)."""
+    stack, stats = state[0], state[1]
+    # frames entered before tracing started (or excluded) are not ours
+    if not stack or stack[-1][1] is not code:
+        return
+    caller, _, start, child = stack.pop()
+    incl = now - start
+    if stack:
+        stack[-1][3] += incl
+    excl = incl - child
+    key = (caller, code)
+    acc = stats.get(key)
+    if acc is None:
+        stats[key] = [1, incl, excl, incl, incl]
+    else:
+        acc[0] += 1
+        acc[1] += incl
+        acc[2] += excl
+        if incl < acc[3]:
+            acc[3] = incl
+        if incl > acc[4]:
+            acc[4] = incl
+
+
+def _push_stack(state: list, caller: Optional[CodeType], code: CodeType, start: int) -> None:
+    """Open a call and intern its full path as (parent stack id, code)."""
+    stack, intern = state[0], state[4]
+    key = (stack[-1][4] if stack else 0, code)
+    sid = intern.get(key)
+    if sid is None:
+        nodes = state[3]
+        sid = intern[key] = len(nodes)
+        nodes.append(key)
+    stack.append([caller, code, start, 0, sid])
+
+
+def _leave_stack(state: list, code: CodeType, now: int) -> None:
+    """`_leave`, also crediting the call's self time to its stack id."""
+    stack = state[0]
+    if not stack or stack[-1][1] is not code:
+        return
+    top = stack[-1]
+    sid = top.pop()  # back to the 4‑item entry _leave expects
+    excl = now - top[2] - top[3]
+    _leave(state, code, now)
+    acc = state[2].get(sid)
+    if acc is None:
+        state[2][sid] = [1, excl]
+    else:
+        acc[0] += 1
+        acc[1] += excl
 
 
 class RuntimeMonitor:
-    def __init__(self) -> None:
-        self.edges: Dict[CallEdge, int] = {}
-        self._lock = threading.Lock()
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        backend: str = "auto",
+        thread_ids: bool = False,
+        include: Iterable[Path | str] | None = None,
+        exclude: Iterable[Path | str] | None = None,
+        sink: TraceSink | None = None,
+        stacks: bool = False,
+    ) -> None:
+        if backend not in ("auto", "monitoring", "setprofile"):
+            raise ValueError(f"unknown backend {backend!r}")
+        if backend == "monitoring" and not _HAS_MONITORING:
+            raise RuntimeError("sys.monitoring needs Python 3.12+")
+        self.edges: Dict[CallEdge, EdgeStats] = {}
+        self.root = os.path.join(str(Path(root).resolve()), "") if root else None
+        self.filter = CodeFilter([root, *(include or ())] if root else include, exclude)
+        self.backend = "monitoring" if backend == "auto" and _HAS_MONITORING else backend
+        self.thread_ids = thread_ids
+        self.thread_names: Dict[int, str] = {}
+        self.sink = sink
+        self.record_stacks = stacks
+        self.stacks: Dict[StackPath, StackStats] = {}
+        # thread id -> [shadow stack, stats, stack stats, nodes, intern].
+        # Each thread only touches its own state, so the hot path takes no
+        # lock; _collect() merges them.
+        #   stack: [caller code, callee code, start_ns, child_ns(, stack id)] per open call
+        #   stats: (caller code, callee code) -> [calls, incl, excl, min, max]
+        #   stack stats: stack id -> [calls, self_ns]   (stacks=True only)
+        #   nodes / intern: stack id <-> (parent stack id, code); id 0 is the root
+        self._threads: Dict[int, list] = {}
+        self._retired: List[tuple] = []  # (thread id, stats, stack stats, nodes) swapped out by _drain()
+        self._active: list = []  # non‑empty while tracing (setprofile hooks check it)
+        self._tool_id: Optional[int] = None
 
     # context‑manager ---------------------------------------------------
     def __enter__(self):
-        sys.setprofile(self._profile)
+        self._active.append(True)
+        if self.sink is not None:
+            self.sink.open()
+            self.sink.start(lambda: self.sink.write(*self._drain(), thread_names=self._sink_names()), self._pending)
+        if self.backend == "monitoring" and self._start_monitoring():
+            return self  # sys.monitoring already covers every thread
+        self.backend = "setprofile"
+        profile = self._make_profile()
+        threading.setprofile(profile)  # threads started from now on
+        sys.setprofile(profile)
         return self
 
     def __exit__(self, exc_type, exc, tb):
-        sys.setprofile(None)
-
-    # profiler callback -------------------------------------------------
-    def _profile(self, frame: FrameType, event: str, arg):  # noqa: ANN001
-        if event != "call":
-            return
-        caller = frame.f_back
-        callee_name = self._qualname(frame)
-        caller_name = self._qualname(caller) if caller else "<root>"
-        edge = (caller_name, callee_name)
-        with self._lock:
-            self.edges[edge] = self.edges.get(edge, 0) + 1
+        self._unhook()
+        if self.sink is not None:
+            self.sink.stop()
+            self.sink.write(*self._drain(final=True), thread_names=self._sink_names())
+            self.sink.close()
+        else:
+            self._collect()
+
+    def abandon(self) -> None:
+        """Stop tracing and drop everything not yet flushed – e.g. the
+        copy of the parent's monitor a forked child inherits."""
+        self._unhook()
+        self.sink = None  # the parent's file: nothing of ours belongs there
+        self._threads, self._retired = {}, []
+
+    def _unhook(self) -> None:
+        self._active.clear()
+        if self._tool_id is not None:
+            mon = sys.monitoring
+            mon.set_events(self._tool_id, 0)
+            for event in self._callbacks():
+                mon.register_callback(self._tool_id, event, None)
+            mon.free_tool_id(self._tool_id)
+            self._tool_id = None
+        else:
+            threading.setprofile(None)
+            sys.setprofile(None)
+
+    # sys.monitoring backend ---------------------------------------------
+    def _callbacks(self) -> dict:
+        ev = sys.monitoring.events
+        enter, throw, leave, unwind = self._make_hooks()
+        return {
+            ev.PY_START: enter,
+            ev.PY_RESUME: enter,
+            ev.PY_THROW: throw,
+            ev.PY_RETURN: leave,
+            ev.PY_YIELD: leave,
+            ev.PY_UNWIND: unwind,
+        }
+
+    def _start_monitoring(self) -> bool:
+        mon = sys.monitoring
+        try:
+            mon.use_tool_id(mon.PROFILER_ID, "pydiscovery")
+        except ValueError:  # another profiler holds the id
+            return False
+        self._tool_id = mon.PROFILER_ID
+        events = 0
+        for event, callback in self._callbacks().items():
+            mon.register_callback(self._tool_id, event, callback)
+            events |= event
+        mon.set_events(self._tool_id, events)
+        mon.restart_events()  # forget DISABLEs left by an earlier monitor
+        return True
+
+    # The hooks are closures over locals: attribute lookups on `self`
+    # would dominate the cost of an event.
+    def _make_hooks(self):
+        skip, excluded = self.filter.skip, self.filter.excluded
+        threads, new_thread = self._threads, self._new_thread
+        push, leave_ = (_push_stack, _leave_stack) if self.record_stacks else (None, _leave)
+        getframe, get_ident, now = sys._getframe, threading.get_ident, time.perf_counter_ns
+        disable = sys.monitoring.DISABLE
+
+        def enter(code: CodeType, offset: int):  # noqa: ARG001
+            out = skip.get(code)
+            if out is None:
+                out = excluded(code)
+            if out:
+                return disable
+            caller = getframe(1).f_back  # frame 1 is the one starting
+            state = threads.get(get_ident()) or new_thread()
+            if push is None:
+                state[0].append([caller.f_code if caller is not None else None, code, now(), 0])
+            else:
+                push(state, caller.f_code if caller is not None else None, code, now())
+            return None
+
+        def throw(code: CodeType, offset: int, exc: BaseException):  # noqa: ARG001
+            # like enter(), but PY_THROW cannot be disabled (ValueError in the
+            # traced program) – excluded code is skipped via the cache instead
+            out = skip.get(code)
+            if out is None:
+                out = excluded(code)
+            if out:
+                return None
+            caller = getframe(1).f_back  # the frame that called throw() / close()
+            state = threads.get(get_ident()) or new_thread()
+            if push is None:
+                state[0].append([caller.f_code if caller is not None else None, code, now(), 0])
+            else:
+                push(state, caller.f_code if caller is not None else None, code, now())
+            return None
+
+        def leave(code: CodeType, offset: int, retval: object):  # noqa: ARG001
+            if skip.get(code):
+                return disable
+            state = threads.get(get_ident())
+            if state is not None:
+                leave_(state, code, now())
+            return None
+
+        def unwind(code: CodeType, offset: int, exc: BaseException):  # noqa: ARG001
+            state = threads.get(get_ident())  # PY_UNWIND cannot be disabled
+            if state is not None:
+                leave_(state, code, now())
+
+        return enter, throw, leave, unwind
+
+    # sys.setprofile backend ---------------------------------------------
+    def _make_profile(self):
+        skip, excluded = self.filter.skip, self.filter.excluded
+        threads, new_thread = self._threads, self._new_thread
+        push, leave_ = (_push_stack, _leave_stack) if self.record_stacks else (None, _leave)
+        get_ident, now = threading.get_ident, time.perf_counter_ns
+        active = self._active
+
+        def profile(frame: FrameType, event: str, arg):  # noqa: ANN001, ARG001
+            if event == "call":
+                if not active:  # monitor exited: threads unhook themselves
+                    sys.setprofile(None)
+                    return
+                code = frame.f_code
+                out = skip.get(code)
+                if out is None:
+                    out = excluded(code)
+                if out:
+                    return
+                caller = frame.f_back
+                state = threads.get(get_ident()) or new_thread()
+                if push is None:
+                    state[0].append([caller.f_code if caller is not None else None, code, now(), 0])
+                else:
+                    push(state, caller.f_code if caller is not None else None, code, now())
+            elif event == "return":
+                state = threads.get(get_ident())
+                if state is not None:
+                    leave_(state, frame.f_code, now())
+
+        return profile
 
     # helpers -----------------------------------------------------------
+    def _sink_names(self) -> Optional[Dict[int, str]]:
+        return self.thread_names if self.thread_ids else None
+
+    def _new_thread(self) -> tuple:
+        """Create the calling thread's state on its first event."""
+        ident = threading.get_ident()
+        state = self._threads[ident] = [[], {}, {}, [None], {}]  # a single dict store: atomic
+        self.thread_names[ident] = threading.current_thread().name
+        return state
+
+    def _collect(self) -> None:
+        """Merge the per‑thread accumulators into name‑keyed `edges`."""
+        threads, self._threads = self._threads, {}
+        tables = [(ident, state[1], state[2], state[3]) for ident, state in list(threads.items())]
+        self._fold(tables, self.edges, self.stacks)
+
+    def _drain(self, final: bool = False) -> Tuple[Dict[CallEdge, EdgeStats], Dict[StackPath, StackStats]]:
+        """
+        Edge (and stack) deltas since the previous drain, resetting the
+        per‑thread tables.  A table swapped out now is only read on the
+        *next* drain, so a hook still writing to it in another thread is
+        never lost.
+        """
+        retired, self._retired = self._retired, []
+        for ident, state in list(self._threads.items()):
+            if state[1] or state[2]:
+                self._retired.append((ident, state[1], state[2], state[3]))
+                state[1], state[2] = {}, {}
+        if final:
+            retired += self._retired
+            self._retired = []
+        deltas: Dict[CallEdge, EdgeStats] = {}
+        stacks: Dict[StackPath, StackStats] = {}
+        self._fold(retired, deltas, stacks)
+        return deltas, stacks
+
+    def _pending(self) -> int:
+        return sum(len(state[1]) + len(state[2]) for state in list(self._threads.values()))
+
+    def _fold(self, tables: List[tuple], edges: Dict[CallEdge, EdgeStats], stacks: Dict[StackPath, StackStats]) -> None:
+        names: Dict[Optional[CodeType], str] = {}
+        for ident, stats, stack_stats, nodes in tables:
+            if stack_stats:
+                self._fold_stacks(stack_stats, nodes, names, stacks)
+            for (caller, callee), acc in list(stats.items()):  # calls still open are dropped
+                for code in (caller, callee):
+                    if code not in names:
+                        names[code] = self._code_name(code)
+                delta = {
+                    "calls": acc[_CALLS],
+                    "inclusive_ns": acc[_INCL],
+                    "exclusive_ns": acc[_EXCL],
+                    "min_ns": acc[_MIN],
+                    "max_ns": acc[_MAX],
+                    "mean_ns": 0,
+                }
+                if self.thread_ids:
+                    delta["threads"] = {ident: acc[_CALLS]}
+                merge_stats(edges, (names[caller], names[callee]), delta)
+
+    def _fold_stacks(self, stack_stats: dict, nodes: list, names: dict, stacks: Dict[StackPath, StackStats]) -> None:
+        """Expand interned stack ids into name paths (root first) and sum them."""
+        paths: Dict[int, StackPath] = {0: ()}
+
+        def path(sid: int) -> StackPath:
+            todo, node = [], sid
+            while node not in paths:  # iterative: stacks can be deep
+                todo.append(node)
+                node = nodes[node][0]
+            for node in reversed(todo):
+                parent, code = nodes[node]
+                if code not in names:
+                    names[code] = self._code_name(code)
+                paths[node] = paths[parent] + (names[code],)
+            return paths[sid]
+
+        for sid, (calls, self_ns) in list(stack_stats.items()):
+            merge_stacks(stacks, path(sid), {"calls": calls, "self_ns": self_ns})
+
+    @staticmethod
+    def _code_name(code: CodeType | None) -> str:
+        if code is None:
+            return ROOT_CALLER
+        # the first line tells apart same‑named functions of one file
+        return f"{code.co_filename}:{code.co_firstlineno}:{code.co_name}"
+
     @staticmethod
     def _qualname(frame: FrameType | None) -> str:
-        if frame is None:
-            return "<root>"
-        code = frame.f_code
-        return f"{code.co_filename}:{code.co_name}"
\ No newline at end of file
+        return RuntimeMonitor._code_name(frame.f_code if frame is not None else None)
@@ -0,0 +1,206 @@
+# pydiscovery/analyzer/sampling_monitor.py
+"""
+Statistical counterpart of `RuntimeMonitor` for long‑running jobs.  Usage:
+
+>>> from pydiscovery.analyzer.sampling_monitor import SamplingMonitor
+>>> with SamplingMonitor(hz=100) as mon:
+...     run_pipeline()
+>>> print(mon.edges)
+
+A background thread wakes *hz* times per second, grabs every thread's stack
+with `sys._current_frames()` and credits each caller→callee pair on the
+stack with the wall time since the previous sample.  `edges` uses the
+`RuntimeMonitor` keys, with estimated times instead of measured ones::
+
+    {"samples": 37, "inclusive_ns": …, "exclusive_ns": …}
+
+Call counts are not observable by sampling.  Overhead does not depend on
+the call rate: the sampler measures its own cost and stretches the
+interval whenever a sample would take more than *budget* (default 2 %) of
+it, e.g. for very deep stacks or many threads.  *root* / *include* /
+*exclude* filter frames and *sink* streams deltas as in `RuntimeMonitor`;
+``stacks=True`` also keeps `stacks`, the sampled paths of traced frames
+(``{"samples": …, "self_ns": …}``), for flame graphs.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pydiscovery.analyzer.runtime_monitor import CallEdge, CodeFilter, RuntimeMonitor, StackPath
+from pydiscovery.analyzer.trace_sink import TraceSink, merge_stacks, merge_stats
+
+SampleStats = Dict[str, int]  # samples, inclusive_ns, exclusive_ns
+
+
+class SamplingMonitor:
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        hz: float = 100.0,
+        budget: float = 0.02,
+        thread_ids: bool = False,
+        include: Iterable[Path | str] | None = None,
+        exclude: Iterable[Path | str] | None = None,
+        sink: TraceSink | None = None,
+        stacks: bool = False,
+    ) -> None:
+        if hz <= 0 or not 0 < budget < 1:
+            raise ValueError("hz must be positive and budget within (0, 1)")
+        self.edges: Dict[CallEdge, SampleStats] = {}
+        self.root = os.path.join(str(Path(root).resolve()), "") if root else None
+        self.filter = CodeFilter([root, *(include or ())] if root else include, exclude)
+        self.hz = hz
+        self.budget = budget
+        self.thread_ids = thread_ids
+        self.thread_names: Dict[int, str] = {}
+        self.samples = 0
+        self.sink = sink
+        self.record_stacks = stacks
+        self.stacks: Dict[StackPath, SampleStats] = {}
+        # only the sampler thread writes these until _collect()
+        #   thread id -> {(caller code, callee code): [samples, incl, excl]}
+        #   thread id -> {(innermost code, …, outermost code): [samples, self_ns]}
+        self._threads: Dict[int, Dict[Tuple[Optional[CodeType], CodeType], List[int]]] = {}
+        self._stacks: Dict[int, Dict[Tuple[CodeType, ...], List[int]]] = {}
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    # context‑manager ---------------------------------------------------
+    def __enter__(self):
+        if self.sink is not None:
+            self.sink.open()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._run, name="pydiscovery-sampler", daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        if self.sink is not None:
+            self.sink.write(*self._drain(), thread_names=self._sink_names())
+            self.sink.close()
+        else:
+            self._collect()
+
+    def abandon(self) -> None:
+        """Stop sampling and drop everything not yet flushed (see
+        `RuntimeMonitor.abandon`)."""
+        self._stop.set()
+        self._sampler = None  # threads do not survive fork(): nothing to join
+        self.sink = None
+        self._threads, self._stacks = {}, {}
+
+    # sampler thread ----------------------------------------------------
+    def _run(self) -> None:
+        me = threading.get_ident()
+        interval = 1.0 / self.hz
+        delay = interval
+        sink = self.sink
+        now = time.perf_counter_ns
+        last = now()
+        while not self._stop.wait(delay):
+            start = now()
+            weight, last = start - last, start  # wall time this sample stands for
+            for ident, frame in sys._current_frames().items():
+                if ident != me:
+                    self._sample(ident, frame, weight)
+            self.samples += 1
+            if sink is not None and sink.due(sum(len(t) for t in self._threads.values())):
+                sink.write(*self._drain(), thread_names=self._sink_names())  # the sampler owns the tables: no race
+            cost = (now() - start) / 1e9
+            delay = max(interval, cost / self.budget) - cost
+
+    def _sample(self, ident: int, frame: FrameType, weight: int) -> None:
+        stats = self._threads.get(ident)
+        if stats is None:
+            stats = self._threads[ident] = {}
+            if ident not in self.thread_names:
+                self._name_thread(ident)
+        skip, excluded = self.filter.skip, self.filter.excluded
+        seen = set()  # recursion: credit each edge once per stack
+        codes: Optional[List[CodeType]] = [] if self.record_stacks else None
+        leaf = True
+        f: Optional[FrameType] = frame
+        while f is not None:
+            code = f.f_code
+            parent = f.f_back
+            out = skip.get(code)
+            if out is None:
+                out = excluded(code)
+            if not out:
+                key = (parent.f_code if parent is not None else None, code)
+                acc = stats.get(key)
+                if acc is None:
+                    acc = stats[key] = [0, 0, 0]
+                if key not in seen:
+                    seen.add(key)
+                    acc[0] += 1
+                    acc[1] += weight
+                if leaf:  # innermost traced frame owns the exclusive time
+                    acc[2] += weight
+                    leaf = False
+                if codes is not None:
+                    codes.append(code)
+            f = parent
+        if codes:
+            paths = self._stacks.get(ident)
+            if paths is None:
+                paths = self._stacks[ident] = {}
+            path = tuple(codes)
+            acc = paths.get(path)
+            if acc is None:
+                paths[path] = [1, weight]
+            else:
+                acc[0] += 1
+                acc[1] += weight
+
+    # helpers -----------------------------------------------------------
+    def _sink_names(self) -> Optional[Dict[int, str]]:
+        return self.thread_names if self.thread_ids else None
+
+    def _name_thread(self, ident: int) -> None:
+        for thread in threading.enumerate():
+            if thread.ident == ident:
+                self.thread_names[ident] = thread.name
+
+    def _collect(self) -> None:
+        """Merge the per‑thread sample counts into name‑keyed `edges`."""
+        self._fold(self._threads, self._stacks, self.edges, self.stacks)
+        self._threads, self._stacks = {}, {}
+
+    def _drain(self) -> Tuple[Dict[CallEdge, SampleStats], Dict[StackPath, SampleStats]]:
+        """Sample deltas since the previous drain (sampler thread or after it)."""
+        threads, self._threads = self._threads, {}
+        paths, self._stacks = self._stacks, {}
+        deltas: Dict[CallEdge, SampleStats] = {}
+        stacks: Dict[StackPath, SampleStats] = {}
+        self._fold(threads, paths, deltas, stacks)
+        return deltas, stacks
+
+    def _fold(self, threads: dict, paths: dict, edges: Dict[CallEdge, SampleStats], stacks: Dict[StackPath, SampleStats]) -> None:
+        names: Dict[Optional[CodeType], str] = {}
+        for by_path in paths.values():
+            for codes, (samples, self_ns) in by_path.items():
+                for code in codes:
+                    if code not in names:
+                        names[code] = RuntimeMonitor._code_name(code)
+                path = tuple(names[code] for code in reversed(codes))
+                merge_stacks(stacks, path, {"samples": samples, "self_ns": self_ns})
+        for ident, stats in threads.items():
+            for (caller, callee), (samples, incl, excl) in stats.items():
+                for code in (caller, callee):
+                    if code not in names:
+                        names[code] = RuntimeMonitor._code_name(code)
+                delta = {"samples": samples, "inclusive_ns": incl, "exclusive_ns": excl}
+                if self.thread_ids:
+                    delta["threads"] = {ident: samples}
+                merge_stats(edges, (names[caller], names[callee]), delta)
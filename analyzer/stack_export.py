@@ -0,0 +1,96 @@
+# pydiscovery/analyzer/stack_export.py
+"""
+Flame‑graph exports for `RuntimeMonitor.stacks` / `SamplingMonitor.stacks`
+(``{path: {"calls" | "samples": …, "self_ns": …}}``):
+
+* `write_collapsed()` – Brendan Gregg's collapsed‑stack text, one
+  ``outer;…;inner <self ns>`` line per path, for ``flamegraph.pl``,
+  inferno or speedscope's importer;
+* `write_speedscope()` – a speedscope.app JSON document (one "sampled"
+  profile weighted by self time in nanoseconds).
+
+Frames are labelled ``function (file:line)`` like other Python profilers.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from pydiscovery.analyzer.runtime_monitor import StackPath, parse_frame
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+def collapsed_lines(stacks: Dict[StackPath, Dict[str, Any]]) -> List[str]:
+    """Collapsed‑stack lines, sorted, weighted by self time (ns)."""
+    lines = []
+    for path, stats in stacks.items():
+        if stats.get("self_ns", 0) > 0:
+            frames = ";".join(_label(name).replace(";", ",") for name in path)
+            lines.append(f"{frames} {stats['self_ns']}")
+    return sorted(lines)
+
+
+def write_collapsed(stacks: Dict[StackPath, Dict[str, Any]], path: Path | str) -> Path:
+    out = Path(path)
+    with out.open("w", encoding="utf-8") as fh:
+        for line in collapsed_lines(stacks):
+            fh.write(line)
+            fh.write("\n")
+    return out
+
+
+def speedscope(stacks: Dict[StackPath, Dict[str, Any]], name: str = "pdtrace") -> Dict[str, Any]:
+    """The speedscope file‑format document for *stacks*."""
+    frames: List[Dict[str, str]] = []
+    index: Dict[str, int] = {}
+    samples: List[List[int]] = []
+    weights: List[int] = []
+    for path, stats in sorted(stacks.items()):
+        weight = stats.get("self_ns", 0)
+        if weight <= 0:
+            continue
+        sample = []
+        for frame in path:
+            i = index.get(frame)
+            if i is None:
+                file, line, func = parse_frame(frame)
+                i = index[frame] = len(frames)
+                frames.append({"name": func, "file": file, "line": line} if line else {"name": func, "file": file})
+            sample.append(i)
+        samples.append(sample)
+        weights.append(weight)
+    return {
+        "$schema": SPEEDSCOPE_SCHEMA,
+        "name": name,
+        "exporter": "pydiscovery",
+        "activeProfileIndex": 0,
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "nanoseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+        ],
+    }
+
+
+def write_speedscope(stacks: Dict[StackPath, Dict[str, Any]], path: Path | str, name: str = "pdtrace") -> Path:
+    out = Path(path)
+    with out.open("w", encoding="utf-8") as fh:
+        json.dump(speedscope(stacks, name), fh, separators=(",", ":"))
+    return out
+
+
+# ---------------------------------------------------------------------------
+def _label(name: str) -> str:
+    file, line, func = parse_frame(name)
+    if not file:
+        return func
+    return f"{func} ({file}:{line})" if line else f"{func} ({file})"
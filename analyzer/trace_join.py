@@ -0,0 +1,137 @@
+# pydiscovery/analyzer/trace_join.py
+"""
+Join a runtime trace onto the static knowledge graph.
+
+Trace frames are ``"file:line:function"`` names (`RuntimeMonitor`), graph
+elements carry their root‑relative `file` and ``metadata["lines"]``
+(``[first, last]``, decorators included).  `join_trace()` maps every callee
+frame to the innermost `FunctionElement` whose range holds the frame's
+first line:
+
+* the frame *is* the function (same first line) – its calls, inclusive and
+  exclusive time are credited;
+* the frame is code nested in it (a lambda, comprehension, …) – only its
+  exclusive time is, as that time already counts towards the function's
+  inclusive time.
+
+A `ClassElement` gets the calls and exclusive time of everything within its
+range.  Totals are stored as ``metadata["runtime"]`` and the elements are
+saved back; the return value is the "hot elements" report – elements ranked
+by exclusive time, with their share of all traced self time.  Sampled traces
+(`SamplingMonitor`) are joined the same way, with ``samples`` for ``calls``.
+"""
+from __future__ import annotations
+
+import json
+import os
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pydiscovery.analyzer.runtime_monitor import parse_frame
+from pydiscovery.model.code_element import CodeElement
+from pydiscovery.repository.code_element_repository import CodeElementRepository
+
+_JOINED = ("FUNCTION", "CLASS")
+
+
+def load_runtime_calls(path: Path | str) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """Read pdtrace's runtime_calls.json back into ``{(caller, callee): stats}``."""
+    with Path(path).open("r", encoding="utf-8") as fh:
+        entries = json.load(fh)
+    return {(e.pop("caller"), e.pop("callee")): e for e in entries}
+
+
+def join_trace(
+    repo: CodeElementRepository,
+    edges: Dict[Tuple[str, str], Dict[str, Any]],
+    root: Path | str,
+) -> List[Dict[str, Any]]:
+    """Annotate *repo*'s functions / classes with *edges* and return the ranked report."""
+    root = Path(root).resolve()
+    index = _LineIndex(e for e in repo.all_elements() if e.type in _JOINED and "lines" in e.metadata)
+    count = "samples" if any("samples" in s for s in edges.values()) else "calls"
+
+    # callee frame -> [calls, inclusive, exclusive]
+    frames: Dict[str, List[int]] = {}
+    for (_, callee), stats in edges.items():
+        acc = frames.setdefault(callee, [0, 0, 0])
+        acc[0] += stats.get(count, 0)
+        acc[1] += stats.get("inclusive_ns", 0)
+        acc[2] += stats.get("exclusive_ns", 0)
+
+    totals: Dict[str, Dict[str, int]] = {}  # qualname -> runtime stats
+    elements: Dict[str, CodeElement] = {}
+    rels: Dict[str, Optional[str]] = {}
+    for name, (calls, incl, excl) in frames.items():
+        file, line, _ = parse_frame(name)
+        rel = rels[file] if file in rels else rels.setdefault(file, _relative(file, root))
+        if rel is None or line is None:
+            continue  # outside the project, or a trace without line numbers
+        func = index.innermost(rel, line, "FUNCTION")
+        if func is not None:
+            stats = totals.setdefault(func.qualname, {count: 0, "inclusive_ns": 0, "exclusive_ns": 0})
+            if func.metadata["lines"][0] == line:
+                stats[count] += calls
+                stats["inclusive_ns"] += incl
+            stats["exclusive_ns"] += excl
+            elements[func.qualname] = func
+        for cls in index.enclosing(rel, line, "CLASS"):
+            stats = totals.setdefault(cls.qualname, {count: 0, "exclusive_ns": 0})
+            if func is not None and func.metadata["lines"][0] == line:
+                stats[count] += calls
+            stats["exclusive_ns"] += excl
+            elements[cls.qualname] = cls
+
+    traced = sum(acc[2] for acc in frames.values()) or 1
+    report = []
+    for qualname, stats in totals.items():
+        elt = elements[qualname]
+        elt.metadata["runtime"] = stats
+        repo.save(elt)
+        report.append(
+            {
+                "qualname": qualname,
+                "type": elt.type,
+                "file": elt.file,
+                "lines": elt.metadata["lines"],
+                **stats,
+                "share": round(stats["exclusive_ns"] / traced, 4),
+            }
+        )
+    report.sort(key=lambda r: (-r["exclusive_ns"], r["qualname"]))
+    return report
+
+
+# ---------------------------------------------------------------------------
+class _LineIndex:
+    """Per file, the functions / classes sorted by first line."""
+
+    def __init__(self, elements: Iterable[CodeElement]) -> None:
+        by_file: Dict[str, List[Tuple[int, int, CodeElement]]] = {}
+        for elt in elements:
+            first, last = elt.metadata["lines"]
+            by_file.setdefault(elt.file or "", []).append((first, last, elt))
+        self._files = {f: sorted(spans, key=lambda s: (s[0], -s[1])) for f, spans in by_file.items()}
+        self._starts = {f: [s[0] for s in spans] for f, spans in self._files.items()}
+
+    def enclosing(self, file: str, line: int, element_type: str) -> List[CodeElement]:
+        """Elements of *element_type* whose range holds *line*, outermost first."""
+        spans = self._files.get(file)
+        if not spans:
+            return []
+        end = bisect_right(self._starts[file], line)  # only spans starting at or before line
+        return [elt for first, last, elt in spans[:end] if last >= line and elt.type == element_type]
+
+    def innermost(self, file: str, line: int, element_type: str) -> Optional[CodeElement]:
+        hits = self.enclosing(file, line, element_type)
+        return hits[-1] if hits else None
+
+
+def _relative(file: str, root: Path) -> Optional[str]:
+    if file.startswith("<"):
+        return None
+    try:
+        return Path(os.path.abspath(file)).resolve().relative_to(root).as_posix()
+    except ValueError:
+        return None
@@ -0,0 +1,205 @@
+# pydiscovery/analyzer/trace_sink.py
+"""
+Append‑only, periodically flushed storage for long traces.
+
+Handed to `RuntimeMonitor(sink=…)` or `SamplingMonitor(sink=…)`, a
+`TraceSink` receives the edges accumulated since the previous flush –
+every *interval* seconds, or sooner once *max_edges* distinct edges are
+pending – and appends them as compact JSON Lines::
+
+    {"kind":"header","pid":4242,"started":1700000000.0,"argv":["job.py"]}
+    {"kind":"edge","caller":"prog.py:9:work","callee":"lib.py:3:parse","calls":3,"inclusive_ns":…}
+    {"kind":"stack","stack":["prog.py:9:work","lib.py:3:parse"],"calls":3,"self_ns":…}
+    {"kind":"threads","names":{"140234":"worker-1"}}
+
+Frames are ``file:line:name`` as in `RuntimeMonitor`.  With ``thread_ids``
+the names of newly seen threads precede the first edges that use them, so
+`merge_trace()` keys every per‑thread breakdown by the name the thread had
+in *its own* process.  The monitor's
+in‑memory tables are reset on every flush, so memory stays bounded however
+long the trace runs, and a crash only loses what was not yet flushed (at
+most about two intervals).  `merge_trace()` folds one or more such files
+back into the `RuntimeMonitor.edges` shape (`pdtrace --merge` writes it as
+runtime_calls.json), `merge_stack_trace()` the ``stack`` records (written
+with ``stacks=True``) into the `RuntimeMonitor.stacks` shape.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set
+
+CallEdge = tuple  # (caller, callee) – see runtime_monitor.CallEdge
+StackPath = tuple  # see runtime_monitor.StackPath
+
+# fields summed across deltas; min_ns / max_ns / threads / processes are merged specially
+_SUMMED = ("calls", "samples", "inclusive_ns", "exclusive_ns")
+
+
+class TraceSink:
+    def __init__(self, path: Path | str, interval: float = 10.0, max_edges: int = 50_000) -> None:
+        if interval <= 0 or max_edges <= 0:
+            raise ValueError("interval and max_edges must be positive")
+        self.path = Path(path)
+        self.interval = interval
+        self.max_edges = max_edges
+        self.flushes = 0
+        self._fh = None
+        self._named: Set[int] = set()  # thread idents whose name is written
+        self._last = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # file --------------------------------------------------------------
+    def open(self) -> None:
+        self._fh = self.path.open("a", encoding="utf-8")
+        self._last = time.monotonic()
+        header = {"kind": "header", "pid": os.getpid(), "started": time.time(), "argv": sys.argv}
+        self._fh.write(json.dumps(header) + "\n")
+        self._fh.flush()
+
+    def write(
+        self,
+        edges: Dict[CallEdge, Dict[str, Any]],
+        stacks: Optional[Dict[StackPath, Dict[str, Any]]] = None,
+        thread_names: Optional[Dict[int, str]] = None,
+    ) -> None:
+        """Append one delta record per edge (and stack) and push it to the OS."""
+        self._last = time.monotonic()
+        self.flushes += 1
+        if not edges and not stacks:
+            return
+        fh = self._fh
+        if thread_names:
+            new = {ident: name for ident, name in dict(thread_names).items() if ident not in self._named}
+            if new:
+                self._named.update(new)
+                fh.write(json.dumps({"kind": "threads", "names": new}, separators=(",", ":")))
+                fh.write("\n")
+        for (caller, callee), stats in edges.items():
+            record = {"kind": "edge", "caller": caller, "callee": callee, **stats}
+            fh.write(json.dumps(record, separators=(",", ":")))
+            fh.write("\n")
+        for path, stats in (stacks or {}).items():
+            fh.write(json.dumps({"kind": "stack", "stack": path, **stats}, separators=(",", ":")))
+            fh.write("\n")
+        fh.flush()
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    # scheduling --------------------------------------------------------
+    def due(self, pending: int) -> bool:
+        """Is a flush owed, *pending* edges being buffered?"""
+        return pending >= self.max_edges or time.monotonic() - self._last >= self.interval
+
+    def start(self, flush: Callable[[], None], pending: Callable[[], int]) -> None:
+        """Call *flush* from a background thread whenever one is due."""
+        poll = min(self.interval, 0.5)
+
+        def loop() -> None:
+            while not self._stop.wait(poll):
+                if self.due(pending()):
+                    flush()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=loop, name="pydiscovery-trace-sink", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def iter_trace(path: Path | str) -> Iterator[Dict[str, Any]]:
+    """Yield the records of a sink file, skipping a torn last line."""
+    with Path(path).open("r", encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                yield json.loads(line)
+            except ValueError:  # the writer died mid‑line
+                continue
+
+
+def merge_trace(paths: Iterable[Path | str], by_process: bool = False) -> Dict[CallEdge, Dict[str, Any]]:
+    """
+    Sum the edge deltas of one or more sink files into final edge stats.
+    With *by_process* every edge also gets ``"processes": {pid: calls}``
+    (samples for sampled traces), the pid taken from each file's header.
+    Per‑thread breakdowns are keyed by the thread names each file recorded.
+    """
+    edges: Dict[CallEdge, Dict[str, Any]] = {}
+    for path in paths:
+        pid = None
+        names: Dict[str, str] = {}  # this process's thread idents (JSON keys)
+        for record in iter_trace(path):
+            kind = record.pop("kind", None)
+            if kind == "header":
+                pid = str(record.get("pid"))
+            elif kind == "threads":
+                names.update(record["names"])
+            if kind != "edge":
+                continue
+            edge = (record.pop("caller"), record.pop("callee"))
+            if names and "threads" in record:
+                by_name: Dict[str, int] = {}
+                for ident, calls in record["threads"].items():
+                    name = names.get(ident, ident)
+                    by_name[name] = by_name.get(name, 0) + calls
+                record["threads"] = by_name
+            if by_process and pid is not None:
+                record["processes"] = {pid: record.get("calls", record.get("samples", 0))}
+            merge_stats(edges, edge, record)
+    return edges
+
+
+def merge_stack_trace(paths: Iterable[Path | str]) -> Dict[StackPath, Dict[str, Any]]:
+    """Sum the stack deltas of one or more sink files."""
+    stacks: Dict[StackPath, Dict[str, Any]] = {}
+    for path in paths:
+        for record in iter_trace(path):
+            if record.pop("kind", None) == "stack":
+                merge_stacks(stacks, tuple(record.pop("stack")), record)
+    return stacks
+
+
+def merge_stacks(stacks: Dict[StackPath, Dict[str, Any]], path: StackPath, delta: Dict[str, Any]) -> None:
+    """Fold one stack's *delta* (calls / samples, self_ns) into *stacks*."""
+    merged = stacks.get(path)
+    if merged is None:
+        stacks[path] = dict(delta)
+        return
+    for key, value in delta.items():
+        merged[key] = merged.get(key, 0) + value
+
+
+def merge_stats(edges: Dict[CallEdge, Dict[str, Any]], edge: CallEdge, delta: Dict[str, Any]) -> None:
+    """Fold one edge's *delta* into *edges* (sums, min / max, per‑thread / per‑process counts)."""
+    merged = edges.get(edge)
+    if merged is None:
+        merged = edges[edge] = {}
+    for key, value in delta.items():
+        if key in _SUMMED:
+            merged[key] = merged.get(key, 0) + value
+        elif key == "min_ns":
+            merged[key] = min(merged.get(key, value), value)
+        elif key == "max_ns":
+            merged[key] = max(merged.get(key, value), value)
+        elif key in ("threads", "processes"):
+            counts = merged.setdefault(key, {})
+            for ident, n in value.items():
+                counts[ident] = counts.get(ident, 0) + n
+        elif key == "mean_ns":
+            merged.setdefault(key, 0)  # recomputed below; keeps the key order
+        else:
+            merged[key] = value
+    if merged.get("calls"):
+        merged["mean_ns"] = merged["inclusive_ns"] // merged["calls"]
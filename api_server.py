@@ -4,51 +4,379 @@ Start with:
 
 >>> from pydiscovery.api_server import serve
 >>> serve(repository_instance)
+
+* One thread per connection (`ThreadingHTTPServer`), so a slow client no
+  longer blocks every other dashboard (`threaded=False` restores the old
+  single‑threaded server).
+* Response bodies are serialised once per route as compact JSON and cached
+  until the repository's `generation` changes.  They are built under *lock*;
+  a writer updating the repository while serving (`launcher --watch`) holds
+  the same lock, so no response sees a half‑applied change.
+* Every body carries an `ETag`; a matching `If-None-Match` gets `304`.
+* Bodies are gzip / deflate compressed when the client's `Accept-Encoding`
+  allows it; compressed variants are cached next to the raw body.  Add
+  `?pretty=1` for indented JSON.
+
+`GET /elements` accepts query parameters, answered from the repository's
+indexes via `CodeElementRepository.query()`:
+
+    type=CLASS          element type
+    file=pkg/mod.py     defining file (root‑relative)
+    name=Conf           bare‑name prefix
+    prefix=pkg.sub.     qualified‑name prefix ("everything in package X")
+    fields=name,file    project each element onto these keys
+    limit=100           page size (default 1000, max 10000)
+    cursor=…            `next_cursor` of the previous page
+
+With any parameter the response is a page:
+`{"items": [...], "next_cursor": "…" | null}`.
+
+`GET /elements/{name}/deps?depth=k` and `/elements/{name}/dependents?depth=k`
+return the k‑hop neighbourhood of an element (qualified name, or every
+element with that bare name) as `{"nodes": [...], "edges": [...]}`, answered
+by a BFS over adjacency / reverse‑adjacency lists built once per repository
+generation.  `limit` caps the node count (`"truncated": true` when hit).
 """
+import base64
+import binascii
+import gzip
+import hashlib
 import json
 import logging
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from typing import Any
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlencode, urlsplit
 
 from pydiscovery.repository.code_element_repository import CodeElementRepository
 
 LOG = logging.getLogger(__name__)
 
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 10_000
+_QUERY_PARAMS = {"type", "file", "name", "prefix", "fields", "limit", "cursor"}
+MAX_DEPTH = 10
+DEFAULT_NODE_LIMIT = 1000
+MAX_NODE_LIMIT = 10_000
+MIN_COMPRESS_SIZE = 1024  # smaller bodies are sent as‑is
+_ENCODINGS = {
+    "gzip": lambda body: gzip.compress(body, compresslevel=6, mtime=0),
+    "deflate": lambda body: zlib.compress(body, 6),
+}
+
+
+class _GraphIndex:
+    """
+    Integer adjacency lists over the repository's elements.
+
+    A dependency string resolves to the element with that qualified name,
+    else to every element with that bare name; strings that resolve to
+    nothing (builtins, third‑party names) are kept as `external` leaves.
+    """
+
+    def __init__(self, repo: CodeElementRepository) -> None:
+        elements = list(repo.all_elements())
+        self.qualnames = [e.qualname for e in elements]
+        self.names = [e.name for e in elements]
+        self.types = [e.type for e in elements]
+        self.by_qualname = {q: i for i, q in enumerate(self.qualnames)}
+        self.by_name: Dict[str, List[int]] = {}
+        for i, name in enumerate(self.names):
+            self.by_name.setdefault(name, []).append(i)
+
+        self.deps: List[Tuple[int, ...]] = []
+        self.external: List[Tuple[str, ...]] = []
+        rdeps: List[List[int]] = [[] for _ in elements]
+        for i, elt in enumerate(elements):
+            targets: List[int] = []
+            unresolved: List[str] = []
+            for dep in sorted(elt.dependencies):
+                found = self.resolve(dep)
+                if found:
+                    targets.extend(found)
+                else:
+                    unresolved.append(dep)
+            targets = list(dict.fromkeys(t for t in targets if t != i))
+            self.deps.append(tuple(targets))
+            self.external.append(tuple(unresolved))
+            for t in targets:
+                rdeps[t].append(i)
+        self.dependents = [tuple(r) for r in rdeps]
+
+    def resolve(self, name: str) -> List[int]:
+        i = self.by_qualname.get(name)
+        return [i] if i is not None else self.by_name.get(name, [])
+
+    def neighbourhood(self, roots: List[int], reverse: bool, depth: int, limit: int) -> Dict[str, Any]:
+        adjacency = self.dependents if reverse else self.deps
+        seen = {r: 0 for r in roots[:limit]}
+        frontier = list(seen)
+        edges: List[Tuple[str, str]] = []
+        truncated = len(roots) > limit
+        for level in range(1, depth + 1):
+            nxt: List[int] = []
+            for i in frontier:
+                for j in adjacency[i]:
+                    if j not in seen:
+                        if len(seen) >= limit:
+                            truncated = True
+                            continue
+                        seen[j] = level
+                        nxt.append(j)
+                    src, dst = (j, i) if reverse else (i, j)
+                    edges.append((self.qualnames[src], self.qualnames[dst]))
+            frontier = nxt
+            if not frontier:
+                break
+        # edges between two kept nodes only, so the subgraph is closed
+        kept = {self.qualnames[i] for i in seen}
+        nodes = [
+            {"qualname": self.qualnames[i], "name": self.names[i], "type": self.types[i], "depth": d}
+            for i, d in seen.items()
+        ]
+        if not reverse:
+            for node, i in zip(nodes, seen):
+                if self.external[i] and node["depth"] < depth:
+                    node["external"] = list(self.external[i])
+        return {
+            "roots": [self.qualnames[r] for r in roots],
+            "nodes": nodes,
+            "edges": [list(e) for e in edges if e[0] in kept and e[1] in kept],
+            "truncated": truncated,
+        }
+
+
+class _ResponseCache:
+    """Serialised bodies per route / query, valid for one repository generation."""
+
+    def __init__(
+        self,
+        repo: CodeElementRepository,
+        max_entries: int = 512,
+        lock: Optional[threading.Lock] = None,
+    ) -> None:
+        self.repo = repo
+        self._max_entries = max_entries
+        # key -> (generation, etag, body, {encoding: compressed body})
+        self._entries: Dict[str, Tuple[int, str, bytes, Dict[str, bytes]]] = {}
+        self._lock = lock or threading.Lock()
+        self._graph: Tuple[int, _GraphIndex] | None = None
+
+    def graph(self) -> _GraphIndex:
+        """Adjacency index for the current repository generation."""
+        generation = self.repo.generation
+        graph = self._graph
+        if graph is None or graph[0] != generation:
+            with self._lock:
+                graph = self._graph
+                if graph is None or graph[0] != generation:
+                    graph = self._graph = (generation, _GraphIndex(self.repo))
+        return graph[1]
+
+    def get(
+        self,
+        key: str,
+        build: Callable[[], Any],
+        pretty: bool = False,
+        encoding: str | None = None,
+    ) -> Tuple[str, bytes]:
+        """(etag, body) for *key*, indented if *pretty*, compressed with *encoding*."""
+        if pretty:
+            key += "#pretty"
+        generation = self.repo.generation
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != generation:
+            with self._lock:  # one thread builds, the others wait for its result
+                entry = self._entries.get(key)
+                if entry is None or entry[0] != generation:
+                    obj = build()
+                    if pretty:
+                        body = json.dumps(obj, indent=2).encode()
+                    else:
+                        body = json.dumps(obj, separators=(",", ":")).encode()
+                    etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+                    self._entries.pop(key, None)
+                    if len(self._entries) >= self._max_entries:  # evict the oldest
+                        del self._entries[next(iter(self._entries))]
+                    entry = self._entries[key] = (generation, etag, body, {})
+        _, etag, body, variants = entry
+        if encoding is None:
+            return etag, body
+        compressed = variants.get(encoding)
+        if compressed is None:  # a race only costs a duplicate compression
+            compressed = variants[encoding] = _ENCODINGS[encoding](body)
+        # each representation needs its own validator
+        return f'{etag[:-1]}-{encoding}"', compressed
+
 
 class _Handler(BaseHTTPRequestHandler):
     """Dynamic handler bound to a repository instance via closure."""
 
     repo: CodeElementRepository  # injected later
+    cache: _ResponseCache  # injected later
+    _pretty = False
+    protocol_version = "HTTP/1.1"  # keep‑alive for polling clients
 
     def _send(self, obj: Any, status: int = 200) -> None:
-        body = json.dumps(obj, indent=2).encode()
+        body = json.dumps(obj, separators=(",", ":")).encode()
+        self._send_body(body, status)
+
+    def _send_body(
+        self,
+        body: bytes,
+        status: int = 200,
+        etag: str | None = None,
+        encoding: str | None = None,
+    ) -> None:
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(body)))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
         self.end_headers()
         self.wfile.write(body)
 
+    def _send_cached(self, key: str, build: Callable[[], Any]) -> None:
+        etag, body = self.cache.get(key, build, pretty=self._pretty)
+        encoding = self._accepted_encoding() if len(body) >= MIN_COMPRESS_SIZE else None
+        if encoding:
+            etag, body = self.cache.get(key, build, pretty=self._pretty, encoding=encoding)
+        if etag in self._if_none_match():
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+        self._send_body(body, etag=etag, encoding=encoding)
+
+    def _accepted_encoding(self) -> str | None:
+        """Preferred of gzip / deflate allowed by `Accept-Encoding`, if any."""
+        accepted: Dict[str, float] = {}
+        for part in self.headers.get("Accept-Encoding", "").split(","):
+            coding, _, q = part.strip().partition(";")
+            try:
+                weight = float(q.strip()[2:]) if q.strip().startswith("q=") else 1.0
+            except ValueError:
+                weight = 0.0
+            accepted[coding.strip().lower()] = weight
+        return max(
+            (coding for coding in _ENCODINGS if accepted.get(coding, accepted.get("*", 0)) > 0),
+            key=lambda coding: accepted.get(coding, accepted.get("*", 0)),
+            default=None,
+        )
+
+    def _if_none_match(self) -> set:
+        raw = self.headers.get("If-None-Match", "")
+        return {tag.strip() for tag in raw.split(",") if tag.strip()}
+
     # routes -----------------------------------------------------------
     def do_GET(self):  # noqa: N802
-        if self.path == "/elements":
-            elems = [e.to_dict() for e in self.repo.all_elements()]
-            self._send(elems)
-        elif self.path == "/relationships":
-            rel = {
-                e.name: sorted(e.dependencies)
-                for e in self.repo.all_elements() if e.dependencies
-            }
-            self._send(rel)
+        url = urlsplit(self.path)
+        path = url.path
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        self._pretty = params.pop("pretty", "0").lower() in ("1", "true", "yes")
+        if path.startswith("/elements/") and path.endswith(("/deps", "/dependents")):
+            name, _, direction = path[len("/elements/"):].rpartition("/")
+            self._neighbourhood(unquote(name), direction == "dependents", params)
+        elif path == "/elements" and params:
+            self._query_elements(params)
+        elif path == "/elements":
+            self._send_cached(path, lambda: [e.to_dict() for e in self.repo.all_elements()])
+        elif path == "/relationships":
+            self._send_cached(
+                path,
+                lambda: {
+                    e.name: sorted(e.dependencies)
+                    for e in self.repo.all_elements() if e.dependencies
+                },
+            )
         else:
             self._send({"error": "not found"}, status=404)
 
+    def _query_elements(self, params: Dict[str, str]) -> None:
+        unknown = set(params) - _QUERY_PARAMS
+        if unknown:
+            self._send({"error": f"unknown parameter(s): {', '.join(sorted(unknown))}"}, status=400)
+            return
+        try:
+            limit = int(params.get("limit", DEFAULT_LIMIT))
+            after = _decode_cursor(params["cursor"]) if "cursor" in params else None
+        except (ValueError, binascii.Error):
+            self._send({"error": "invalid limit or cursor"}, status=400)
+            return
+        if not 1 <= limit <= MAX_LIMIT:
+            self._send({"error": f"limit must be between 1 and {MAX_LIMIT}"}, status=400)
+            return
+        fields = [f for f in params.get("fields", "").split(",") if f]
+
+        def build() -> Dict[str, Any]:
+            page = self.repo.query(
+                element_type=params.get("type"),
+                file=params.get("file"),
+                name_prefix=params.get("name"),
+                qualname_prefix=params.get("prefix"),
+                after=after,
+                limit=limit + 1,  # one extra tells us whether another page exists
+            )
+            more = len(page) > limit
+            page = page[:limit]
+            return {
+                "items": [_project(e.to_dict(), fields) for e in page],
+                "next_cursor": _encode_cursor(page[-1].qualname) if more else None,
+            }
+
+        self._send_cached("/elements?" + urlencode(sorted(params.items())), build)
+
+    def _neighbourhood(self, name: str, reverse: bool, params: Dict[str, str]) -> None:
+        try:
+            depth = int(params.get("depth", 1))
+            limit = int(params.get("limit", DEFAULT_NODE_LIMIT))
+        except ValueError:
+            self._send({"error": "invalid depth or limit"}, status=400)
+            return
+        if not 0 <= depth <= MAX_DEPTH or not 1 <= limit <= MAX_NODE_LIMIT:
+            self._send({"error": f"depth must be 0..{MAX_DEPTH}, limit 1..{MAX_NODE_LIMIT}"}, status=400)
+            return
+        graph = self.cache.graph()
+        roots = graph.resolve(name)
+        if not roots:
+            self._send({"error": f"no element named {name!r}"}, status=404)
+            return
+        key = f"{self.path.split('?')[0]}?depth={depth}&limit={limit}"
+        self._send_cached(key, lambda: graph.neighbourhood(roots, reverse, depth, limit))
+
     # silence logs
     def log_message(self, fmt: str, *args):  # noqa: D401, ANN001
         LOG.debug(fmt, *args)
 
 
-def serve(repo: CodeElementRepository, host: str = "127.0.0.1", port: int = 8000) -> None:
+def _project(elt: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    return {f: elt[f] for f in fields if f in elt} if fields else elt
+
+
+def _encode_cursor(qualname: str) -> str:
+    return base64.urlsafe_b64encode(qualname.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> str:
+    return base64.b64decode(cursor + "=" * (-len(cursor) % 4), altchars=b"-_", validate=True).decode()
+
+
+def serve(
+    repo: CodeElementRepository,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    threaded: bool = True,
+    lock: Optional[threading.Lock] = None,
+) -> None:
     _Handler.repo = repo  # type: ignore[attr-defined]
-    httpd = HTTPServer((host, port), _Handler)
+    _Handler.cache = _ResponseCache(repo, lock=lock)  # type: ignore[attr-defined]
+    server_cls = ThreadingHTTPServer if threaded else HTTPServer
+    httpd = server_cls((host, port), _Handler)
+    httpd.daemon_threads = True
     LOG.info("API server running at http://%s:%d", host, port)
-    httpd.serve_forever()
\ No newline at end of file
+    httpd.serve_forever()
@@ -9,8 +9,25 @@ Run PyDiscovery from **any working directory**, including when the shell’s cwd
 * Overwrites `pydiscovery/knowledge_graph.json` on every run.
 * Emits only relative file paths inside the graph (the single absolute
   `"root"` key suffices to reconstruct them).
-* Pretty‑prints JSON to stdout using the same conversion helper that ensures
-  sets / Path objects are serialisable.
+* Streams the graph to disk (`--compact` drops indentation) and echoes the
+  written file to stdout unless `--no-stdout` is given.
+* `--format ndjson` writes `knowledge_graph.ndjson` (JSON Lines) instead.
+* `--binary` additionally writes the mmap‑friendly `knowledge_graph.pdkg`.
+* `--db PATH` keeps elements in a SQLite database instead of memory; the
+  database can later be served by `api_server` without re‑analysing.
+* `--jobs N` analyses files on N worker processes (`0` = one per CPU).
+* Per‑file results are cached in `pydiscovery/analysis_cache.<hash>.pickle`,
+  one file per analysed project root, so re‑runs only re‑analyse changed
+  files (`--no-cache` disables this).
+* `--delta` also writes `pydiscovery/knowledge_graph.delta.json`, the
+  changes since the previous graph (see `util.graph_delta.apply_delta`).
+* `--runtime runtime_calls.json` joins a `pdtrace` run onto the graph:
+  functions / classes get `metadata["runtime"]` (calls, time) and the
+  ranked report is written to `pydiscovery/hot_elements.json`.
+* `--watch` keeps running: changed / added / deleted files are re‑analysed
+  in place (see `analyzer.watcher`) and the outputs above rewritten.
+* `--serve PORT` exposes the repository through `api_server` – with
+  `--watch`, a live view that needs no rewrite at all.
 """
 from __future__ import annotations
 
@@ -27,46 +44,214 @@ if str(_PROJECT_ROOT) not in sys.path:
 
 # ------------------------------------------------------------------ #
 # 2.  standard‑lib + internal imports (after path tweak)
+import argparse
 import json
 import logging
+import shutil
+import threading
 from uuid import uuid4
 
+from pydiscovery.analyzer.analysis_cache import AnalysisCache
 from pydiscovery.analyzer.code_analyzer import CodeAnalyzer
+from pydiscovery.analyzer.trace_join import join_trace, load_runtime_calls
+from pydiscovery.analyzer.watcher import ProjectWatcher
+from pydiscovery.api_server import serve
+from pydiscovery.repository.code_element_repository import CodeElementRepository
 from pydiscovery.repository.in_memory_repository import InMemoryCodeElementRepository
+from pydiscovery.repository.sqlite_repository import SqliteCodeElementRepository
+from pydiscovery.util.binary_graph import BinaryGraphWriter
+from pydiscovery.util.graph_delta import diff_graphs, load_graph
 from pydiscovery.util.knowledge_graph_file_handler import KnowledgeGraphFileHandler
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
 LOG = logging.getLogger("pydiscovery.launcher")
 
 
-def main() -> None:
-    if len(sys.argv) < 2:
-        print(
-            "Usage:\n"
-            "  python launcher.py <path‑to‑project>            # from inside pydiscovery\n"
-            "  python -m pydiscovery.launcher <path‑to‑project> # from parent directory"
-        )
-        sys.exit(1)
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="launcher.py",
+        usage=(
+            "\n"
+            "  python launcher.py <path‑to‑project> [options]            # from inside pydiscovery\n"
+            "  python -m pydiscovery.launcher <path‑to‑project> [options] # from parent directory"
+        ),
+    )
+    parser.add_argument("project", help="root folder of the project to analyse")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, metavar="N",
+        help="worker processes for parsing/analysis (0 = one per CPU, default 1)",
+    )
+    parser.add_argument(
+        "--no-cache", dest="cache", action="store_false",
+        help="ignore and do not update the per‑file analysis cache",
+    )
+    parser.add_argument(
+        "--format", choices=("json", "ndjson"), default="json",
+        help="json: one document (default); ndjson: one record per line",
+    )
+    parser.add_argument(
+        "--binary", action="store_true",
+        help="also write the compact binary graph knowledge_graph.pdkg",
+    )
+    parser.add_argument(
+        "--db", type=Path, metavar="PATH",
+        help="store elements in this SQLite database (replaced each run)",
+    )
+    parser.add_argument(
+        "--delta", action="store_true",
+        help="also write knowledge_graph.delta.json: what changed since the previous graph",
+    )
+    parser.add_argument(
+        "--runtime", type=Path, metavar="JSON",
+        help="annotate elements with a pdtrace runtime_calls.json and write hot_elements.json",
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="keep running and update the outputs whenever a .py file changes",
+    )
+    parser.add_argument(
+        "--serve", type=int, metavar="PORT",
+        help="serve the repository with api_server on 127.0.0.1:PORT",
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="write JSON without indentation (smaller, faster)",
+    )
+    parser.add_argument(
+        "--no-stdout", dest="echo", action="store_false",
+        help="do not echo the knowledge graph to stdout",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
 
-    project_root = Path(sys.argv[1]).resolve()
+    project_root = Path(args.project).resolve()
     if not project_root.exists():
         raise SystemExit(f"Path not found: {project_root}")
 
     LOG.info("Analysing %s …", project_root)
 
     # 3.  run analysis
-    repo = InMemoryCodeElementRepository()
-    graph = CodeAnalyzer(repo).analyse_path(project_root)
+    if args.db:
+        repo = SqliteCodeElementRepository(args.db.resolve())
+        repo.clear()
+    else:
+        repo = InMemoryCodeElementRepository()
+    cache = AnalysisCache.load(project_root) if args.cache else None
+    analyzer = CodeAnalyzer(repo, jobs=args.jobs, cache=cache)
+    # shared with api_server: repository updates and response builds never overlap
+    lock = threading.Lock()
+    # the watcher's baseline scan precedes the analysis, so no edit is missed
+    watcher = ProjectWatcher(project_root, analyzer, lock=lock) if args.watch else None
+    graph = analyzer.analyse_path(project_root, lazy=True)
+
+    # runtime join – before the (lazy) elements are written
+    edges = load_runtime_calls(args.runtime) if args.runtime else None
+    if edges is not None:
+        _join_runtime(repo, edges, project_root, top=10)
+
+    out, previous = _write_outputs(args, graph, repo, project_root)
+
+    if args.echo:
+        with out.open("r", encoding="utf-8") as fh:
+            shutil.copyfileobj(fh, sys.stdout)
+        if args.format == "json":
+            print()
+
+    if args.serve is not None:
+        server = threading.Thread(
+            target=serve, args=(repo,), kwargs={"port": args.serve, "lock": lock}, name="pydiscovery-api", daemon=True
+        )
+        server.start()
+
+    if watcher is not None:
+
+        def on_change(_files: list[str]) -> None:
+            nonlocal previous
+            if edges is not None:
+                with lock:
+                    _join_runtime(repo, edges, project_root)
+            _, previous = _write_outputs(args, analyzer.graph(lazy=True), repo, project_root, previous)
 
+        LOG.info("Watching %s for changes (Ctrl‑C to stop) …", project_root)
+        watcher.run(on_change)
+    elif args.serve is not None:
+        try:
+            server.join()
+        except KeyboardInterrupt:
+            LOG.info("API server stopped")
+
+    if isinstance(repo, SqliteCodeElementRepository):
+        repo.close()
+        LOG.info("Elements stored in %s", args.db)
+
+
+def _join_runtime(repo: CodeElementRepository, edges: dict, project_root: Path, top: int = 0) -> None:
+    report = join_trace(repo, edges, project_root)
+    hot = KnowledgeGraphFileHandler.FILE.with_name("hot_elements.json")
+    with hot.open("w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    LOG.info("Runtime trace joined onto %d element(s); report written to %s", len(report), hot)
+    for entry in report[:top]:
+        LOG.info(
+            "  %5.1f%% %10.2f ms self  %s (%s:%d)",
+            entry["share"] * 100, entry["exclusive_ns"] / 1e6, entry["qualname"], entry["file"], entry["lines"][0],
+        )
+
+
+def _write_outputs(
+    args: argparse.Namespace,
+    graph: dict,
+    repo: CodeElementRepository,
+    project_root: Path,
+    previous: dict | None = None,
+) -> tuple[Path, dict | None]:
+    """
+    Write the graph (plus delta / binary as requested).  Returns the graph
+    file and, with `--delta`, the graph as written – the *previous* graph of
+    the next watch round, so only the first round reads one from disk.
+    """
     # 4.  minimal additional metadata
     graph["analysis_id"] = str(uuid4())
     graph["root"] = str(project_root)
 
-    # 5.  persist & pretty‑print
-    KnowledgeGraphFileHandler.save(graph)
-    LOG.info("Knowledge graph written to %s", KnowledgeGraphFileHandler.FILE)
+    current = None
+    if args.delta:
+        # the previous graph must be read before it is overwritten
+        prev_path = KnowledgeGraphFileHandler.NDJSON_FILE if args.format == "ndjson" else KnowledgeGraphFileHandler.FILE
+        if previous is None and prev_path.is_file():
+            previous = load_graph(prev_path)
+        elif previous is None:
+            LOG.info("No previous graph at %s – no delta written", prev_path)
+        # one JSON‑shaped copy (sets / tuples / Path as on disk): written, diffed and kept
+        current = graph = KnowledgeGraphFileHandler._to_json_safe(dict(graph, elements=list(graph["elements"])))
+
+    # 5.  stream to disk; main() echoes the file (no second serialisation)
+    if args.format == "ndjson":
+        out = KnowledgeGraphFileHandler.save_ndjson(graph)
+    else:
+        out = KnowledgeGraphFileHandler.save(graph, compact=args.compact)
+    LOG.info("Knowledge graph written to %s", out)
+
+    if previous is not None:
+        delta = diff_graphs(previous, current)
+        delta_path = KnowledgeGraphFileHandler.FILE.with_name("knowledge_graph.delta.json")
+        with delta_path.open("w", encoding="utf-8") as fh:
+            json.dump(delta, fh, separators=(",", ":"))
+        elts = delta.get("elements", {})
+        LOG.info(
+            "Delta written to %s: +%d -%d ~%d element(s), %d of %d bytes",
+            delta_path, len(elts.get("added", ())), len(elts.get("removed", ())), len(elts.get("changed", ())),
+            delta_path.stat().st_size, out.stat().st_size,
+        )
 
-    print(json.dumps(KnowledgeGraphFileHandler._to_json_safe(graph), indent=2))
+    if args.binary:
+        # a lazy element generator is spent – convert again for this writer
+        elements = current["elements"] if current is not None else (elt.to_dict() for elt in repo.all_elements())
+        LOG.info("Binary graph written to %s", BinaryGraphWriter.save(dict(graph, elements=elements)))
+    return out, current
 
 
 if __name__ == "__main__":
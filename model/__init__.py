@@ -1,3 +1,6 @@
+from typing import Any, Dict
+
+from pydiscovery.model.code_element import CodeElement, element_id
 from pydiscovery.model.class_element import ClassElement
 from pydiscovery.model.function_element import FunctionElement
 from pydiscovery.model.variable_element import VariableElement
@@ -7,7 +10,33 @@ from pydiscovery.model.external_lib_element import ExternalLibElement
 from pydiscovery.model.config_key_element import ConfigKeyElement
 from pydiscovery.model.decorator_element import DecoratorElement
 
+_ELEMENT_TYPES = {
+    "CLASS": ClassElement,
+    "FUNCTION": FunctionElement,
+    "VARIABLE": VariableElement,
+    "PACKAGE": PackageElement,
+    "MODULE": ModuleElement,
+    "EXTERNAL_LIB": ExternalLibElement,
+    "CONFIG_KEY": ConfigKeyElement,
+    "DECORATOR": DecoratorElement,
+}
+
+
+def element_from_dict(data: Dict[str, Any]) -> CodeElement:
+    """Rebuild an element from `CodeElement.to_dict()` output."""
+    cls = _ELEMENT_TYPES.get(data["type"], CodeElement)
+    elt = cls.__new__(cls)
+    CodeElement.__init__(elt, data["id"], data["type"], data["name"])
+    for key, value in data.items():
+        if key == "dependencies":
+            elt.dependencies = set(value)
+        elif key not in ("id", "type", "name"):
+            setattr(elt, key, value)  # qualname, file, metadata, methods, …
+    return elt
+
+
 __all__ = [
+    "CodeElement",
     "ClassElement",
     "FunctionElement",
     "VariableElement",
@@ -16,4 +45,6 @@ __all__ = [
     "ExternalLibElement",
     "ConfigKeyElement",
     "DecoratorElement",
+    "element_from_dict",
+    "element_id",
 ]
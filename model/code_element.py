@@ -1,9 +1,22 @@
 from __future__ import annotations
 
+import base64
+import hashlib
 from abc import ABC
 from typing import Dict, List, Set, Union
 
 
+def element_id(kind: str, qualname: str, module: str | None = None) -> str:
+    """
+    Short, stable id derived from what identifies an element: its kind,
+    qualified name and (when the qualname does not already encode it) the
+    dotted module name – never a path, which would depend on the checkout.
+    12 URL‑safe characters (72 bits) – identical on every run and machine.
+    """
+    key = f"{kind}\0{qualname}\0{module or ''}".encode("utf-8")
+    return base64.urlsafe_b64encode(hashlib.blake2b(key, digest_size=9).digest()).decode("ascii")
+
+
 class CodeElement(ABC):
     """
     Base domain object for anything we record in the knowledge graph.
@@ -13,6 +26,8 @@ class CodeElement(ABC):
         self.id: str = element_id
         self.type: str = element_type
         self.name: str = name
+        self.qualname: str = name  # analysers refine this, e.g. "pkg.mod.Class.method"
+        self.file: str | None = None  # defining file, relative to the project root
         self.dependencies: Set[str] = set()
         self.metadata: Dict[str, Union[str, int, float, bool, Dict, List]] = {}
 
@@ -23,10 +38,15 @@ class CodeElement(ABC):
 
     # -----------------------------------------------------------------
     def to_dict(self) -> Dict[str, object]:
-        return {
+        out: Dict[str, object] = {
             "id": self.id,
             "type": self.type,
             "name": self.name,
-            "dependencies": sorted(self.dependencies),
-            "metadata": self.metadata,
         }
+        if self.qualname != self.name:  # omitted when redundant – saves tokens
+            out["qualname"] = self.qualname
+        if self.file is not None:
+            out["file"] = self.file
+        out["dependencies"] = sorted(self.dependencies)
+        out["metadata"] = self.metadata
+        return out
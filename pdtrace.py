@@ -4,15 +4,43 @@ pdtrace.py – one‑shot runtime tracer
 ====================================
 
 • Trace every Python call made by a script or package.
-• Writes **runtime_calls.json** to the directory pdtrace.py is launched from.
+• Writes **runtime_calls.json** to the directory pdtrace.py is launched from:
+  one entry per caller → callee edge ("file:line:function" frames) with
+  its call count and inclusive / exclusive / min / max / mean time in
+  nanoseconds.  `launcher.py --runtime runtime_calls.json` joins it onto
+  the knowledge graph.
 • Zero external dependencies – works on stock CPython 3.8 +.
 
 Usage
 -----
-python pdtrace.py <target> [--chdir] [--] [args for target …]
+python pdtrace.py <target> [--chdir] [--threads] [--sample HZ]
+                  [--include PATH]… [--exclude PATH]… [--all] [--flush SECONDS]
+                  [--children] [--stacks] [--] [args for target …]
+python pdtrace.py --merge <runtime_calls.ndjson | folder>…
 
   <target>   .py file, a folder, or an importable package
   --chdir    run from the target folder so its relative paths keep working
+  --threads  add a per‑thread call breakdown to every edge
+  --sample HZ
+             sample stacks HZ times a second instead of tracing every call;
+             ~1‑2 % overhead, edges carry sample counts and estimated times
+  --include PATH, --exclude PATH
+             trace only code under PATH / never under PATH (directory, file
+             or glob; repeatable).  Default: --include <target folder>
+  --all      trace everything, stdlib and site‑packages included
+  --flush SECONDS
+             stream edge deltas to runtime_calls.ndjson every SECONDS
+             (bounded memory; a crash keeps everything flushed so far) and
+             merge them into runtime_calls.json at the end
+  --children also trace the Python processes the target starts
+             (multiprocessing, ProcessPoolExecutor, subprocess); each
+             writes runtime_calls.parts/runtime_calls.<pid>.ndjson and every
+             edge gets a per‑process breakdown ("processes": {pid: calls})
+  --stacks   also record full call paths and write flame graphs next to
+             runtime_calls.json: runtime_stacks.folded (collapsed stacks,
+             self time in ns – flamegraph.pl / inferno) and
+             runtime_stacks.speedscope.json (https://www.speedscope.app)
+  --merge    rebuild runtime_calls.json from .ndjson deltas, e.g. after a crash
 """
 from __future__ import annotations
 
@@ -20,6 +48,7 @@ import importlib.util
 import json
 import os
 import runpy
+import shutil
 import sys
 import time
 from contextlib import contextmanager
@@ -36,6 +65,10 @@ if str(_PKG_ROOT) not in sys.path:
 # If pydiscovery package structure is different, adjust this import
 try:
     from pydiscovery.analyzer.runtime_monitor import RuntimeMonitor # std-lib only
+    from pydiscovery.analyzer.sampling_monitor import SamplingMonitor
+    from pydiscovery.analyzer.trace_sink import TraceSink, merge_stack_trace, merge_trace
+    from pydiscovery.analyzer.stack_export import write_collapsed, write_speedscope
+    from pydiscovery.analyzer.process_tracer import PARTIAL_GLOB, ProcessTracer
 except ImportError:
     print("[Error] Could not import RuntimeMonitor.", file=sys.stderr)
     print(f"        Attempted import relative to: {_PKG_ROOT}", file=sys.stderr)
@@ -43,7 +76,11 @@ except ImportError:
     sys.exit(1)
 
 
-_USAGE = "pdtrace.py <target> [--chdir] [--] [args …]"
+_USAGE = (
+    "pdtrace.py <target> [--chdir] [--threads] [--sample HZ] "
+    "[--include PATH]… [--exclude PATH]… [--all] [--flush SECONDS] [--children] [--stacks] [--] [args …]\n"
+    "       pdtrace.py --merge <runtime_calls.ndjson | folder>…"
+)
 
 
 @contextmanager
@@ -71,6 +108,40 @@ def _maybe_chdir(folder: Path, enabled: bool):
                  print(f"[Warning] Could not chdir back to {prev}: {e}", file=sys.stderr)
 
 
+# ------------------------------------------------------------------#
+def _pop_flag(args: List[str], flag: str) -> bool:
+    """Remove *flag* from *args* if it appears before the target's "--"."""
+    own = args[: args.index("--")] if "--" in args else args
+    if flag in own:
+        args.remove(flag)
+        return True
+    return False
+
+
+def _pop_option(args: List[str], flag: str) -> str | None:
+    """Remove *flag* and its value from *args* (before "--"); return the value."""
+    own = args[: args.index("--")] if "--" in args else args
+    if flag not in own:
+        return None
+    i = args.index(flag)
+    if i + 1 >= len(own):
+        sys.exit(f"{flag} needs a value")
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
+
+
+def _name_threads(edges: Dict[Tuple[str, str], Any], names: Dict[int, str]) -> None:
+    """Key each edge's per‑thread breakdown by thread name instead of ident."""
+    for stats in edges.values():
+        by_name: Dict[str, int] = {}
+        for ident, calls in stats.get("threads", {}).items():
+            name = names.get(int(ident), str(ident))  # str after a JSON round trip
+            by_name[name] = by_name.get(name, 0) + calls
+        if "threads" in stats:
+            stats["threads"] = by_name
+
+
 # ------------------------------------------------------------------#
 # Helpers for resolving the target
 def _single_py(folder: Path) -> Path | None:
@@ -164,18 +235,19 @@ def _dump(edges: Dict[Tuple[str, str], Any], launch_dir: Path, elapsed: float) -
         for (c, d), stats in sorted(edges.items())
     ]
     try:
-        out.write_text(json.dumps(payload, indent=2), encoding='utf-8')
+        _write_json(out, payload)
         print(
             f"\n[pdtrace] saved {len(payload)} calls to {out} "
             f"in {elapsed:.1f}s"
         )
+        _print_hot(payload)
     except OSError as e:
         print(f"\n[Error] Failed to write trace file to {out}: {e}", file=sys.stderr)
         # Fallback: Try writing to CWD as a last resort if different from launch_dir
         fallback_path = Path.cwd() / "runtime_calls.json"
         if fallback_path != out:
             try:
-                fallback_path.write_text(json.dumps(payload, indent=2), encoding='utf-8')
+                _write_json(fallback_path, payload)
                 print(f"[pdtrace] Fallback: Saved trace to {fallback_path}", file=sys.stderr)
                 out = fallback_path # Update return value if fallback succeeded
             except OSError as e_fallback:
@@ -184,6 +256,38 @@ def _dump(edges: Dict[Tuple[str, str], Any], launch_dir: Path, elapsed: float) -
     return out
 
 
+def _dump_stacks(stacks: Dict[Tuple[str, ...], Any], launch_dir: Path) -> None:
+    """Write the flame‑graph exports of *stacks* next to runtime_calls.json."""
+    try:
+        folded = write_collapsed(stacks, launch_dir / "runtime_stacks.folded")
+        scope = write_speedscope(stacks, launch_dir / "runtime_stacks.speedscope.json")
+    except OSError as e:
+        print(f"[Error] Failed to write stack exports to {launch_dir}: {e}", file=sys.stderr)
+        return
+    print(f"[pdtrace] saved {len(stacks)} stacks to {folded} and {scope.name}")
+
+
+def _write_json(path: Path, payload: List[Dict[str, Any]]) -> None:
+    # json.dump writes chunk by chunk instead of building one huge string
+    with path.open("w", encoding="utf-8") as fh:
+        json.dump(payload, fh, indent=2)
+
+
+def _print_hot(payload: List[Dict[str, Any]], top: int = 5) -> None:
+    """Print the edges with the most exclusive time – the hot paths."""
+    timed = [e for e in payload if "exclusive_ns" in e]
+    if not timed:
+        return
+    print(f"[pdtrace] hottest {min(top, len(timed))} edges by exclusive time:")
+    for e in sorted(timed, key=lambda e: e["exclusive_ns"], reverse=True)[:top]:
+        count, unit = (e["calls"], "calls") if "calls" in e else (e.get("samples", 0), "samples")
+        print(
+            f"          {e['exclusive_ns'] / 1e6:10.2f} ms self "
+            f"{e['inclusive_ns'] / 1e6:10.2f} ms total "
+            f"{count:>8} {unit}  {e['caller']} → {e['callee']}"
+        )
+
+
 # ------------------------------------------------------------------#
 def main() -> None:
     # Capture the launch directory *before* any potential chdir
@@ -193,11 +297,52 @@ def main() -> None:
         print(_USAGE, file=sys.stderr) # Print usage to stderr
         sys.exit(1) # Exit with error code
 
+    if sys.argv[1] == "--merge":
+        parts: List[Path] = []
+        for arg in sys.argv[2:]:
+            # a folder is a --children run's runtime_calls.parts
+            parts += sorted(Path(arg).glob(PARTIAL_GLOB)) if Path(arg).is_dir() else [Path(arg)]
+        if not parts:
+            sys.exit("--merge needs at least one .ndjson file")
+        edges = merge_trace(parts, by_process=len(parts) > 1)
+        print(f"[pdtrace] merged {len(parts)} file(s)")
+        _dump(edges, launch_dir, 0.0)
+        stacks = merge_stack_trace(parts)
+        if stacks:
+            _dump_stacks(stacks, launch_dir)
+        return
+
     # handle --chdir flag
     args = sys.argv[1:]
     chdir_flag = "--chdir" in args
     if chdir_flag:
         args.remove("--chdir")
+    threads_flag = _pop_flag(args, "--threads")
+    trace_all = _pop_flag(args, "--all")
+    children_flag = _pop_flag(args, "--children")
+    stacks_flag = _pop_flag(args, "--stacks")
+    includes: List[str] = []
+    excludes: List[str] = []
+    while (path := _pop_option(args, "--include")) is not None:
+        includes.append(path)
+    while (path := _pop_option(args, "--exclude")) is not None:
+        excludes.append(path)
+    flush_every = _pop_option(args, "--flush")
+    if flush_every is not None:
+        try:
+            flush_every = float(flush_every)
+        except ValueError:
+            sys.exit(f"--flush needs a number of seconds, got {flush_every!r}")
+        if flush_every <= 0:
+            sys.exit("--flush needs a positive interval")
+    sample_hz = _pop_option(args, "--sample")
+    if sample_hz is not None:
+        try:
+            sample_hz = float(sample_hz)
+        except ValueError:
+            sys.exit(f"--sample needs a number of samples per second, got {sample_hz!r}")
+        if sample_hz <= 0:
+            sys.exit("--sample needs a positive rate")
 
     if not args: # Check if only '--chdir' was passed
          print(_USAGE, file=sys.stderr)
@@ -255,11 +400,42 @@ def main() -> None:
     print(f"[pdtrace] Arguments for target: {tgt_args}")
     print(f"[pdtrace] sys.argv for target: {sys.argv}")
     print(f"[pdtrace] Running with chdir: {chdir_flag}")
+    # project‑scoped by default: stdlib / site‑packages internals drown the graph
+    if not includes and not trace_all:
+        includes = [str(chdir_target_path)]
+    print(f"[pdtrace] Tracing code under: {includes or 'everything'}"
+          + (f", except {excludes}" if excludes else ""))
+    sink = None
+    tracer = None
+    if children_flag:
+        parts_dir = launch_dir / "runtime_calls.parts"
+        tracer = ProcessTracer(
+            parts_dir, include=includes or None, exclude=excludes or None,
+            thread_ids=threads_flag, hz=sample_hz, flush=flush_every or 10.0, stacks=stacks_flag,
+        )
+        print(f"[pdtrace] Tracing child processes too; partial traces in {parts_dir}")
+    elif flush_every:
+        sink_path = launch_dir / "runtime_calls.ndjson"
+        sink_path.unlink(missing_ok=True)  # the sink appends
+        sink = TraceSink(sink_path, interval=flush_every)
+        print(f"[pdtrace] Streaming deltas to {sink_path} every {flush_every:g}s")
+    filters = dict(
+        include=includes or None, exclude=excludes or None, thread_ids=threads_flag, sink=sink, stacks=stacks_flag,
+    )
+    if sample_hz:
+        print(f"[pdtrace] Sampling at {sample_hz:g} Hz")
+    if tracer is not None:
+        monitor = tracer
+    elif sample_hz:
+        monitor = SamplingMonitor(hz=sample_hz, **filters)
+    else:
+        monitor = RuntimeMonitor(**filters)
+    pdtrace_pid = os.getpid()
 
 
     try:
         # Use chdir_target_path for the context manager
-        with _maybe_chdir(chdir_target_path, chdir_flag), RuntimeMonitor() as mon:
+        with _maybe_chdir(chdir_target_path, chdir_flag), monitor as mon:
             try:
                 if prefix and module_name_to_run:
                     print(f"[pdtrace] Executing: runpy.run_module('{module_name_to_run}', run_name='__main__')")
@@ -285,10 +461,29 @@ def main() -> None:
         if 'mon' not in locals():
              mon = None # type: ignore
 
+    if os.getpid() != pdtrace_pid:
+        return  # an os.fork() child of the target unwound to here: the parent reports
+    if tracer is not None and 'mon' in locals() and mon is not None:
+        mon.merge()
+        print(f"[pdtrace] merged {len(tracer.partials())} process trace(s) from {tracer.directory}")
+    if sink is not None and 'mon' in locals() and mon is not None:
+        mon.edges = merge_trace([sink.path])  # the run's deltas → final stats
+        if stacks_flag:
+            mon.stacks = merge_stack_trace([sink.path])
+        print(f"[pdtrace] merged {sink.flushes} flush(es) from {sink.path}")
+    if threads_flag and sink is None and tracer is None and 'mon' in locals() and mon is not None:
+        _name_threads(mon.edges, mon.thread_names)  # merged traces are named per process already
+
     # Ensure mon exists and has edges before dumping
     if 'mon' in locals() and mon is not None and hasattr(mon, 'edges'):
          # Pass the captured launch_dir to _dump
          out_file = _dump(mon.edges, launch_dir, time.perf_counter() - start)
+         if stacks_flag:
+             _dump_stacks(mon.stacks, launch_dir)
+         if sink is not None and out_file.is_file():
+             sink.path.unlink(missing_ok=True)  # merged; the deltas are redundant now
+         if tracer is not None and out_file.is_file():
+             shutil.rmtree(tracer.directory, ignore_errors=True)
          # summary -------------------------------------------------
          print("[pdtrace] ✅ Trace capture finished.") # Changed from success as it might have ended early
          print(f"[pdtrace] 📄 Trace file attempted save at: {out_file}")
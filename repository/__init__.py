@@ -4,8 +4,10 @@ pydiscovery.repository package – abstractions over element storage.
 
 from pydiscovery.repository.code_element_repository import CodeElementRepository
 from pydiscovery.repository.in_memory_repository import InMemoryCodeElementRepository
+from pydiscovery.repository.sqlite_repository import SqliteCodeElementRepository
 
 __all__ = [
     "CodeElementRepository",
     "InMemoryCodeElementRepository",
+    "SqliteCodeElementRepository",
 ]
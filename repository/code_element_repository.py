@@ -5,7 +5,7 @@ Abstract interface for element storage back‑ends.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Iterable, Optional
+from typing import Iterable, List, Optional
 
 from pydiscovery.model.code_element import CodeElement
 
@@ -13,6 +13,9 @@ from pydiscovery.model.code_element import CodeElement
 class CodeElementRepository(ABC):
     """Storage abstraction so we can replace in‑memory storage later."""
 
+    # bumped by every save() / delete(); lets readers (e.g. api_server) cache derived data
+    generation: int = 0
+
     @abstractmethod
     def save(self, element: CodeElement) -> None: ...
 
@@ -21,3 +24,61 @@ class CodeElementRepository(ABC):
 
     @abstractmethod
     def all_elements(self) -> Iterable[CodeElement]: ...
+
+    def delete(self, qualname: str) -> bool:
+        """Remove the element stored under *qualname*; False if there was none."""
+        raise NotImplementedError(f"{type(self).__name__} does not support deletion")
+
+    # queries ----------------------------------------------------------
+    # Linear‑scan defaults; indexed back‑ends override them.
+    def find_by_qualname(self, qualname: str) -> Optional[CodeElement]:
+        return next((e for e in self.all_elements() if e.qualname == qualname), None)
+
+    def find_by_type(self, element_type: str) -> List[CodeElement]:
+        return [e for e in self.all_elements() if e.type == element_type]
+
+    def find_by_file(self, file: str) -> List[CodeElement]:
+        return [e for e in self.all_elements() if e.file == file]
+
+    def find_dependents(self, name: str) -> List[CodeElement]:
+        """Elements that list *name* among their dependencies ("who uses X")."""
+        return [e for e in self.all_elements() if name in e.dependencies]
+
+    def query(
+        self,
+        element_type: str | None = None,
+        file: str | None = None,
+        name_prefix: str | None = None,
+        qualname_prefix: str | None = None,
+        after: str | None = None,
+        limit: int | None = None,
+    ) -> List[CodeElement]:
+        """
+        Elements matching every given filter, ordered by qualname.  *after*
+        is the last qualname of the previous page (keyset pagination).
+        """
+        hits = sorted(
+            (
+                e for e in self.all_elements()
+                if matches(e, element_type, file, name_prefix, qualname_prefix)
+                and (after is None or e.qualname > after)
+            ),
+            key=lambda e: e.qualname,
+        )
+        return hits if limit is None else hits[:limit]
+
+
+def matches(
+    element: CodeElement,
+    element_type: str | None,
+    file: str | None,
+    name_prefix: str | None,
+    qualname_prefix: str | None,
+) -> bool:
+    """Shared predicate behind `CodeElementRepository.query()`."""
+    return (
+        (element_type is None or element.type == element_type)
+        and (file is None or element.file == file)
+        and (not name_prefix or element.name.startswith(name_prefix))
+        and (not qualname_prefix or element.qualname.startswith(qualname_prefix))
+    )
@@ -1,25 +1,148 @@
 """
 pydiscovery/repository/in_memory_repository.py
 Simple in‑memory implementation of CodeElementRepository.
+
+Besides the primary store (keyed by qualified name) it keeps secondary
+indexes by bare name, type, defining file and reverse dependency, updated
+incrementally on every `save()` / `delete()`.  `query()` additionally uses
+sorted views (qualnames, names, index buckets) built lazily once per
+`generation`.  Elements are mutable: call `save()` again after changing an
+element to re‑index it (and, for persistent back‑ends such as
+`SqliteCodeElementRepository`, to store the change).
 """
 from __future__ import annotations
 
-from typing import Dict, Iterable, Optional
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 from pydiscovery.model.code_element import CodeElement
-from pydiscovery.repository.code_element_repository import CodeElementRepository
+from pydiscovery.repository.code_element_repository import CodeElementRepository, matches
+
+# index bucket: qualname -> element (ordered, O(1) add / remove)
+_Bucket = Dict[str, CodeElement]
+
+_MAX_CHAR = "\U0010ffff"  # sorts after every other character: prefix upper bound
 
 
 class InMemoryCodeElementRepository(CodeElementRepository):
     def __init__(self) -> None:
+        # keyed by qualified name so `a.Config` and `b.Config` both survive
         self._store: Dict[str, CodeElement] = {}
+        self._by_name: Dict[str, _Bucket] = {}  # most recently saved last
+        self._by_type: Dict[str, _Bucket] = {}
+        self._by_file: Dict[str | None, _Bucket] = {}
+        self._dependents: Dict[str, _Bucket] = {}
+        # what each qualname was indexed under, so re‑saves can undo it
+        self._indexed: Dict[str, Tuple[str, str, str | None, FrozenSet[str]]] = {}
+        # sorted views for query(), valid for one generation
+        self._sorted: Dict[tuple, list] = {}
+        self._sorted_generation = -1
 
     # ------------------------------------------------------------------
     def save(self, element: CodeElement) -> None:
-        self._store[element.name] = element
+        key = element.qualname
+        self.generation += 1
+        self._unindex(key)
+        self._store[key] = element
+
+        deps = frozenset(element.dependencies)
+        self._by_name.setdefault(element.name, {})[key] = element
+        self._by_type.setdefault(element.type, {})[key] = element
+        self._by_file.setdefault(element.file, {})[key] = element
+        for dep in deps:
+            self._dependents.setdefault(dep, {})[key] = element
+        self._indexed[key] = (element.name, element.type, element.file, deps)
+
+    def delete(self, qualname: str) -> bool:
+        if self._store.pop(qualname, None) is None:
+            return False
+        self.generation += 1
+        self._unindex(qualname)
+        return True
 
     def find_by_name(self, name: str) -> Optional[CodeElement]:
-        return self._store.get(name)
+        bucket = self._by_name.get(name)
+        return next(reversed(bucket.values())) if bucket else None
 
     def all_elements(self) -> Iterable[CodeElement]:
         return self._store.values()
+
+    # indexed queries --------------------------------------------------
+    def find_by_qualname(self, qualname: str) -> Optional[CodeElement]:
+        return self._store.get(qualname)
+
+    def find_by_type(self, element_type: str) -> List[CodeElement]:
+        return list(self._by_type.get(element_type, {}).values())
+
+    def find_by_file(self, file: str) -> List[CodeElement]:
+        return list(self._by_file.get(file, {}).values())
+
+    def find_dependents(self, name: str) -> List[CodeElement]:
+        return list(self._dependents.get(name, {}).values())
+
+    def query(
+        self,
+        element_type: str | None = None,
+        file: str | None = None,
+        name_prefix: str | None = None,
+        qualname_prefix: str | None = None,
+        after: str | None = None,
+        limit: int | None = None,
+    ) -> List[CodeElement]:
+        # candidate qualnames from the most selective index, in qualname order
+        sources: List[List[str]] = []
+        if element_type is not None:
+            sources.append(self._sorted_view(("type", element_type), self._by_type.get(element_type, {})))
+        if file is not None:
+            sources.append(self._sorted_view(("file", file), self._by_file.get(file, {})))
+        if name_prefix:
+            names = self._sorted_view(("names",), None)
+            lo = bisect_left(names, (name_prefix,))
+            hi = bisect_left(names, (name_prefix + _MAX_CHAR,))
+            sources.append(sorted(q for _, q in names[lo:hi]))
+        keys = self._sorted_view(("qualnames",), self._store)
+        if qualname_prefix:
+            keys = keys[bisect_left(keys, qualname_prefix):bisect_left(keys, qualname_prefix + _MAX_CHAR)]
+        sources.append(keys)
+        candidates = min(sources, key=len)
+
+        start = bisect_right(candidates, after) if after is not None else 0
+        hits = (
+            self._store[q] for q in islice(candidates, start, None)
+            if matches(self._store[q], element_type, file, name_prefix, qualname_prefix)
+        )
+        return list(hits if limit is None else islice(hits, limit))
+
+    # ------------------------------------------------------------------
+    def _sorted_view(self, key: tuple, bucket: Optional[_Bucket]) -> list:
+        if self._sorted_generation != self.generation:
+            self._sorted.clear()
+            self._sorted_generation = self.generation
+        view = self._sorted.get(key)
+        if view is None:
+            if bucket is None:  # ("names",): (name, qualname) pairs
+                view = sorted((e.name, q) for q, e in self._store.items())
+            else:
+                view = sorted(bucket)
+            self._sorted[key] = view
+        return view
+
+    def _unindex(self, key: str) -> None:
+        old = self._indexed.pop(key, None)
+        if old is None:
+            return
+        name, element_type, file, deps = old
+        self._discard(self._by_name, name, key)
+        self._discard(self._by_type, element_type, key)
+        self._discard(self._by_file, file, key)
+        for dep in deps:
+            self._discard(self._dependents, dep, key)
+
+    @staticmethod
+    def _discard(index: Dict, bucket_key, key: str) -> None:  # noqa: ANN001
+        bucket = index.get(bucket_key)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del index[bucket_key]
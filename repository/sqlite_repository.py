@@ -0,0 +1,232 @@
+"""
+pydiscovery/repository/sqlite_repository.py
+SQLite implementation of CodeElementRepository (standard library `sqlite3`).
+
+For graphs larger than RAM and for serving a stored graph without
+re‑running analysis:
+
+* `elements` holds one row per qualified name (the full `to_dict()` JSON
+  plus indexed `name` / `type` / `file` columns);
+* `dependencies` and `metadata` are indexed side tables, so "who depends on
+  X" and "which elements have metadata key K" are index lookups;
+* `save()` buffers elements and writes them in batches, one transaction per
+  batch; every query flushes the buffer first;
+* `all_elements()` iterates a cursor – elements are rebuilt lazily.
+
+Elements returned by queries are fresh objects: call `save()` after
+mutating one to persist the change.  The connection is shared between
+threads (e.g. a threaded `api_server`) behind a lock.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from pydiscovery.model import element_from_dict
+from pydiscovery.model.code_element import CodeElement
+from pydiscovery.repository.code_element_repository import CodeElementRepository
+
+_MAX_CHAR = "\U0010ffff"  # sorts after every other character: prefix upper bound
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS elements (
+    qualname TEXT PRIMARY KEY,
+    id       TEXT NOT NULL,
+    type     TEXT NOT NULL,
+    name     TEXT NOT NULL,
+    file     TEXT,
+    seq      INTEGER NOT NULL,
+    data     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_elements_name ON elements(name, seq);
+CREATE INDEX IF NOT EXISTS ix_elements_type ON elements(type);
+CREATE INDEX IF NOT EXISTS ix_elements_file ON elements(file);
+
+CREATE TABLE IF NOT EXISTS dependencies (
+    qualname TEXT NOT NULL,
+    dep      TEXT NOT NULL,
+    PRIMARY KEY (qualname, dep)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_dependencies_dep ON dependencies(dep);
+
+CREATE TABLE IF NOT EXISTS metadata (
+    qualname TEXT NOT NULL,
+    key      TEXT NOT NULL,
+    value    TEXT NOT NULL,
+    PRIMARY KEY (qualname, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_metadata_key ON metadata(key, value);
+"""
+
+
+class SqliteCodeElementRepository(CodeElementRepository):
+    def __init__(self, path: Path | str = ":memory:", batch_size: int = 1000) -> None:
+        self.path = path
+        self._batch_size = batch_size
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        (last,) = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM elements").fetchone()
+        self._seq = last
+        self._pending: Dict[str, CodeElement] = {}  # qualname -> element, first‑save order
+        self._pending_seq: Dict[str, int] = {}       # qualname -> seq of latest save
+
+    # ------------------------------------------------------------------
+    def save(self, element: CodeElement) -> None:
+        # seq orders saves, so the newest element wins in find_by_name
+        with self._lock:
+            self._seq += 1
+            self.generation += 1
+            self._pending[element.qualname] = element
+            self._pending_seq[element.qualname] = self._seq
+            if len(self._pending) >= self._batch_size:
+                self.flush()
+
+    def delete(self, qualname: str) -> bool:
+        with self._lock:
+            pending = self._pending.pop(qualname, None) is not None
+            self._pending_seq.pop(qualname, None)
+            with self._conn:
+                for table in ("dependencies", "metadata"):
+                    self._conn.execute(f"DELETE FROM {table} WHERE qualname = ?", (qualname,))
+                stored = self._conn.execute("DELETE FROM elements WHERE qualname = ?", (qualname,)).rowcount > 0
+            if pending or stored:
+                self.generation += 1
+            return pending or stored
+
+    def find_by_name(self, name: str) -> Optional[CodeElement]:
+        return self._one("SELECT data FROM elements WHERE name = ? ORDER BY seq DESC LIMIT 1", (name,))
+
+    def all_elements(self) -> Iterator[CodeElement]:
+        return self._many("SELECT data FROM elements ORDER BY rowid", ())
+
+    # indexed queries --------------------------------------------------
+    def find_by_qualname(self, qualname: str) -> Optional[CodeElement]:
+        return self._one("SELECT data FROM elements WHERE qualname = ?", (qualname,))
+
+    def find_by_type(self, element_type: str) -> List[CodeElement]:
+        return list(self._many("SELECT data FROM elements WHERE type = ? ORDER BY rowid", (element_type,)))
+
+    def find_by_file(self, file: str) -> List[CodeElement]:
+        return list(self._many("SELECT data FROM elements WHERE file = ? ORDER BY rowid", (file,)))
+
+    def find_dependents(self, name: str) -> List[CodeElement]:
+        return list(
+            self._many(
+                "SELECT e.data FROM dependencies d JOIN elements e ON e.qualname = d.qualname "
+                "WHERE d.dep = ? ORDER BY e.rowid",
+                (name,),
+            )
+        )
+
+    def query(
+        self,
+        element_type: str | None = None,
+        file: str | None = None,
+        name_prefix: str | None = None,
+        qualname_prefix: str | None = None,
+        after: str | None = None,
+        limit: int | None = None,
+    ) -> List[CodeElement]:
+        where, params = [], []
+        if element_type is not None:
+            where.append("type = ?")
+            params.append(element_type)
+        if file is not None:
+            where.append("file = ?")
+            params.append(file)
+        # prefix ranges instead of LIKE so the name / primary‑key indexes apply
+        if name_prefix:
+            where.append("name >= ? AND name < ?")
+            params += [name_prefix, name_prefix + _MAX_CHAR]
+        if qualname_prefix:
+            where.append("qualname >= ? AND qualname < ?")
+            params += [qualname_prefix, qualname_prefix + _MAX_CHAR]
+        if after is not None:
+            where.append("qualname > ?")
+            params.append(after)
+        sql = "SELECT data FROM elements"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY qualname"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return list(self._many(sql, tuple(params)))
+
+    def find_by_metadata(self, key: str, value: object = None) -> List[CodeElement]:
+        """Elements having metadata *key* (equal to *value* when given)."""
+        sql = "SELECT e.data FROM metadata m JOIN elements e ON e.qualname = m.qualname WHERE m.key = ?"
+        params: tuple = (key,)
+        if value is not None:
+            sql += " AND m.value = ?"
+            params += (json.dumps(value, sort_keys=True),)
+        return list(self._many(sql + " ORDER BY e.rowid", params))
+
+    # lifecycle --------------------------------------------------------
+    def flush(self) -> None:
+        """Write buffered elements in a single transaction."""
+        with self._lock:
+            if self._pending:
+                self._flush()
+
+    def _flush(self) -> None:
+        pending, seqs = self._pending, self._pending_seq
+        self._pending, self._pending_seq = {}, {}
+        rows, deps, meta = [], [], []
+        for key, elt in pending.items():
+            rows.append((key, elt.id, elt.type, elt.name, elt.file, seqs[key], json.dumps(elt.to_dict(), default=list)))
+            deps.extend((key, dep) for dep in elt.dependencies)
+            meta.extend((key, k, json.dumps(v, sort_keys=True, default=list)) for k, v in elt.metadata.items())
+        keys = [(key,) for key in pending]
+        with self._conn:
+            self._conn.executemany("DELETE FROM dependencies WHERE qualname = ?", keys)
+            self._conn.executemany("DELETE FROM metadata WHERE qualname = ?", keys)
+            self._conn.executemany(
+                "INSERT INTO elements (qualname, id, type, name, file, seq, data) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(qualname) DO UPDATE SET id = excluded.id, type = excluded.type, "
+                "name = excluded.name, file = excluded.file, seq = excluded.seq, data = excluded.data",
+                rows,
+            )
+            self._conn.executemany("INSERT OR IGNORE INTO dependencies (qualname, dep) VALUES (?, ?)", deps)
+            self._conn.executemany("INSERT INTO metadata (qualname, key, value) VALUES (?, ?, ?)", meta)
+
+    def clear(self) -> None:
+        """Drop every stored element (e.g. before a fresh analysis run)."""
+        with self._lock:
+            self._pending.clear()
+            self._pending_seq.clear()
+            with self._conn:
+                for table in ("elements", "dependencies", "metadata"):
+                    self._conn.execute(f"DELETE FROM {table}")
+            self._seq = 0
+            self.generation += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    def _one(self, sql: str, params: tuple) -> Optional[CodeElement]:
+        with self._lock:
+            self.flush()
+            row = self._conn.execute(sql, params).fetchone()
+        return element_from_dict(json.loads(row[0])) if row else None
+
+    def _many(self, sql: str, params: tuple, chunk: int = 500) -> Iterator[CodeElement]:
+        # rows are fetched in chunks so the lock is never held across a yield
+        with self._lock:
+            self.flush()
+            cursor = self._conn.execute(sql, params)
+            rows = cursor.fetchmany(chunk)
+        while rows:
+            for (data,) in rows:
+                yield element_from_dict(json.loads(data))
+            with self._lock:
+                rows = cursor.fetchmany(chunk)
@@ -0,0 +1,61 @@
+# pydiscovery/tests/test_binary_graph.py
+"""Binary graph: a .pdkg round trip must give back the JSON graph."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from pydiscovery.analyzer.code_analyzer import CodeAnalyzer
+from pydiscovery.repository.in_memory_repository import InMemoryCodeElementRepository
+from pydiscovery.util.binary_graph import BinaryGraphReader, BinaryGraphWriter
+from pydiscovery.util.knowledge_graph_file_handler import KnowledgeGraphFileHandler
+
+
+@pytest.fixture
+def graph(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "app.py").write_text(
+        "import json\n\n\nclass Service:\n    def run(self):\n        return json.dumps(hello())\n\n\n"
+        "def hello():\n    return 'héllo'\n",
+        encoding="utf-8",
+    )
+    (src / "empty.py").write_text("", encoding="utf-8")
+    graph = CodeAnalyzer(InMemoryCodeElementRepository()).analyse_path(src)
+    graph.update(analysis_id="one", root=str(src))
+    return json.loads(json.dumps(graph, default=KnowledgeGraphFileHandler._json_default))
+
+
+def test_round_trip(graph, tmp_path):
+    path = BinaryGraphWriter.save(graph, path=tmp_path / "g.pdkg")
+    with BinaryGraphReader(path) as g:
+        assert len(g) == len(graph["elements"])
+        assert [g.element(i) for i in range(len(g))] == graph["elements"]
+        assert g.to_graph() == graph
+        assert [e["name"] for e in g.find("hello")] == ["hello"]
+        assert g.find("missing") == []
+    assert not path.with_name("g.pdkg.tmp").exists()
+
+
+def test_round_trip_without_elements(tmp_path):
+    path = BinaryGraphWriter.save({"files": [], "elements": iter(())}, path=tmp_path / "g.pdkg")
+    with BinaryGraphReader(path) as g:
+        assert len(g) == 0
+        assert g.to_graph() == {"files": [], "elements": []}
+
+
+@pytest.mark.parametrize("keep", [0, 10, -1], ids=["empty", "no-header", "cut-short"])
+def test_rejects_damaged_file(graph, tmp_path, keep):
+    data = BinaryGraphWriter.save(graph, path=tmp_path / "g.pdkg").read_bytes()
+    damaged = tmp_path / "damaged.pdkg"
+    damaged.write_bytes(data[:keep])
+    with pytest.raises(ValueError, match="not a v1 PyDiscovery binary graph"):
+        BinaryGraphReader(damaged)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "g.pdkg"
+    path.write_bytes(b"{}" * 200)
+    with pytest.raises(ValueError):
+        BinaryGraphReader(path)
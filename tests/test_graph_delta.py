@@ -0,0 +1,80 @@
+# pydiscovery/tests/test_graph_delta.py
+"""graph_delta: apply_delta(old, diff_graphs(old, new)) must rebuild new."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from pydiscovery.analyzer.code_analyzer import CodeAnalyzer
+from pydiscovery.repository.in_memory_repository import InMemoryCodeElementRepository
+from pydiscovery.util.graph_delta import apply_delta, diff_graphs, load_graph
+from pydiscovery.util.knowledge_graph_file_handler import KnowledgeGraphFileHandler
+
+SOURCES = {
+    "app.py": "import json\nfrom util import helper\n\n\ndef main():\n    return helper(json.dumps({}))\n",
+    "util.py": "import os\n\n\ndef helper(x):\n    return os.path.join(x, 'a')\n\n\nclass Box:\n    def get(self):\n        return 1\n",
+    "old.py": "def gone():\n    pass\n",
+}
+
+
+def _graph(root, analysis_id):
+    """What the launcher writes: the analysed graph after one JSON round trip."""
+    graph = CodeAnalyzer(InMemoryCodeElementRepository()).analyse_path(root)
+    graph.update(analysis_id=analysis_id, root=str(root))
+    return json.loads(json.dumps(graph, default=KnowledgeGraphFileHandler._json_default))
+
+
+def _same(graph):
+    """*graph* up to the order apply_delta() may change."""
+    return dict(
+        graph,
+        files=sorted(graph["files"]),
+        elements=sorted(graph["elements"], key=lambda e: e.get("qualname", e["name"])),
+        external_dependencies=sorted(graph["external_dependencies"], key=lambda d: d["package"]),
+    )
+
+
+@pytest.fixture
+def project(tmp_path):
+    for name, text in SOURCES.items():
+        (tmp_path / name).write_text(text, encoding="utf-8")
+    return tmp_path
+
+
+def test_round_trip_after_edit_add_remove(project):
+    old = _graph(project, "one")
+    # edit (a shifted function, a new import), add, remove
+    (project / "util.py").write_text("import os\nimport re\n\n\n" + SOURCES["util.py"][11:], encoding="utf-8")
+    (project / "extra.py").write_text("from util import Box\n\n\ndef make():\n    return Box()\n", encoding="utf-8")
+    (project / "old.py").unlink()
+    new = _graph(project, "two")
+
+    delta = diff_graphs(old, new)
+    assert delta["files"] == {"added": ["extra.py"], "removed": ["old.py"]}
+    assert delta["elements"]["changed"]
+    assert _same(apply_delta(old, delta)) == _same(new)
+    assert _same(apply_delta(old, diff_graphs(old, old))) == _same(old)
+
+
+def test_header_unset(project):
+    old = dict(_graph(project, "one"), runtime="runtime_calls.json")
+    new = _graph(project, "two")
+    delta = diff_graphs(old, new)
+    assert delta["header"] == {"analysis_id": "two", "unset": ["runtime"]}
+    assert "runtime" not in apply_delta(old, delta)
+
+
+def test_base_mismatch(project):
+    old = _graph(project, "one")
+    delta = diff_graphs(old, _graph(project, "two"))
+    with pytest.raises(ValueError, match="based on analysis 'one'"):
+        apply_delta(dict(old, analysis_id="other"), delta)
+
+
+def test_load_graph_ndjson(project, tmp_path):
+    graph = _graph(project, "one")
+    path = KnowledgeGraphFileHandler.save_ndjson(graph, path=tmp_path / "graph.ndjson")
+    assert load_graph(path) == graph
+    json_path = KnowledgeGraphFileHandler.save(graph, path=tmp_path / "graph.json")
+    assert load_graph(json_path) == graph
@@ -0,0 +1,93 @@
+# pydiscovery/tests/test_runtime_monitor.py
+"""RuntimeMonitor: the sys.monitoring backend must match sys.setprofile."""
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from pydiscovery.analyzer.runtime_monitor import CodeFilter, RuntimeMonitor
+
+HERE = Path(__file__).parent
+
+needs_monitoring = pytest.mark.skipif(sys.version_info < (3, 12), reason="sys.monitoring needs Python 3.12")
+
+# compiled under a path outside HERE: excluded by RuntimeMonitor(root=HERE)
+_OUTSIDE = {}
+exec(compile("def gen():\n    while True:\n        try:\n            yield 1\n        except KeyError:\n            pass\n",
+             "/elsewhere/outside.py", "exec"), _OUTSIDE)
+
+
+def gen():
+    while True:
+        try:
+            yield 1
+        except KeyError:
+            pass
+
+
+def work(make=gen):
+    g = make()
+    next(g)
+    g.throw(KeyError())
+    g.close()
+
+
+def _calls(mon: RuntimeMonitor) -> dict:
+    return {(caller.rsplit(":", 1)[-1], callee.rsplit(":", 1)[-1]): s["calls"] for (caller, callee), s in mon.edges.items()}
+
+
+@needs_monitoring
+def test_throw_into_generator_matches_setprofile():
+    edges = {}
+    for backend in ("setprofile", "monitoring"):
+        with RuntimeMonitor(root=HERE, backend=backend) as mon:
+            work()
+        assert mon.backend == backend
+        edges[backend] = _calls(mon)
+    assert edges["monitoring"] == edges["setprofile"]
+    assert edges["monitoring"][("work", "gen")] == 3  # next(), throw(), close()
+    assert ("gen", "gen") not in edges["monitoring"]
+
+
+@needs_monitoring
+def test_throw_into_excluded_generator_is_not_disabled():
+    # PY_THROW cannot return DISABLE: CPython would raise in the traced program
+    with RuntimeMonitor(root=HERE, backend="monitoring") as mon:
+        work(_OUTSIDE["gen"])
+        work(_OUTSIDE["gen"])
+    assert not any("outside.py" in callee for _, callee in mon.edges)
+
+
+def _symlinked_module(tmp_path: Path):
+    real = tmp_path / "real"
+    real.mkdir()
+    (real / "symmod.py").write_text("def inner():\n    return 1\n\ndef outer():\n    return inner()\n")
+    link = tmp_path / "link"
+    os.symlink(real, link, target_is_directory=True)
+    spec = importlib.util.spec_from_file_location("symmod", link / "symmod.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return link, module
+
+
+@pytest.mark.parametrize(
+    "backend",
+    ["setprofile", pytest.param("monitoring", marks=needs_monitoring)],
+)
+def test_root_reached_through_symlink(tmp_path, backend):
+    link, module = _symlinked_module(tmp_path)
+    with RuntimeMonitor(root=link, backend=backend) as mon:
+        module.outer()
+    assert _calls(mon).get(("outer", "inner")) == 1
+
+
+def test_code_filter_resolves_both_sides(tmp_path):
+    link, module = _symlinked_module(tmp_path)
+    filename = module.outer.__code__.co_filename  # …/link/symmod.py
+    assert CodeFilter([link]).traces(filename)
+    assert CodeFilter([tmp_path / "real"]).traces(filename)
+    assert not CodeFilter(exclude=[str(link / "*.py")]).traces(filename)
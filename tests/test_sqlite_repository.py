@@ -0,0 +1,93 @@
+# pydiscovery/tests/test_sqlite_repository.py
+"""SqliteCodeElementRepository must answer like the in‑memory repository."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from pydiscovery.analyzer.code_analyzer import CodeAnalyzer
+from pydiscovery.repository.in_memory_repository import InMemoryCodeElementRepository
+from pydiscovery.repository.sqlite_repository import SqliteCodeElementRepository
+from pydiscovery.util.knowledge_graph_file_handler import KnowledgeGraphFileHandler
+
+SOURCES = {
+    "app.py": "import json\nfrom pkg.util import helper\n\n\ndef main():\n    return helper(json.dumps({}))\n",
+    "pkg/__init__.py": "",
+    "pkg/util.py": "import os\n\n\ndef helper(x):\n    return os.path.join(x, 'a')\n\n\n"
+                   "class Box:\n    def get(self):\n        return helper('b')\n\n    def put(self, v):\n        pass\n",
+    "pkg/more.py": "def helper_two():\n    pass\n\n\nclass Crate:\n    pass\n",
+}
+
+
+def _graph(graph):
+    return json.loads(json.dumps(graph, default=KnowledgeGraphFileHandler._json_default))
+
+
+def _qualnames(elements):
+    return [e.qualname for e in elements]
+
+
+@pytest.fixture
+def analysed(tmp_path):
+    src = tmp_path / "src"
+    for rel, text in SOURCES.items():
+        (src / rel).parent.mkdir(parents=True, exist_ok=True)
+        (src / rel).write_text(text, encoding="utf-8")
+    # batch_size=2 keeps elements both flushed and pending
+    sqlite = SqliteCodeElementRepository(tmp_path / "graph.db", batch_size=2)
+    memory = InMemoryCodeElementRepository()
+    analyzers = [CodeAnalyzer(repo) for repo in (memory, sqlite)]
+    graphs = [_graph(a.analyse_path(src)) for a in analyzers]
+    yield src, analyzers, graphs, memory, sqlite
+    sqlite.close()
+
+
+def test_same_graph(analysed):
+    _, _, (from_memory, from_sqlite), _, _ = analysed
+    assert from_sqlite == from_memory
+
+
+def test_same_graph_after_update(analysed):
+    src, analyzers, _, _, _ = analysed
+    (src / "pkg/more.py").unlink()
+    (src / "app.py").write_text(SOURCES["app.py"] + "\n\ndef extra():\n    pass\n", encoding="utf-8")
+    for analyzer in analyzers:
+        assert analyzer.update([src / "app.py"], ["pkg/more.py"]) == ["pkg/more.py", "app.py"]
+    memory, sqlite = (_graph(a.graph()) for a in analyzers)
+    assert sqlite == memory
+    assert "helper_two" not in {e["name"] for e in sqlite["elements"]}
+
+
+def test_delete(analysed):
+    _, _, _, memory, sqlite = analysed
+    for repo in (memory, sqlite):
+        generation = repo.generation
+        assert repo.delete("pkg.util.Box.get") is True
+        assert repo.delete("pkg.util.Box.get") is False
+        assert repo.generation == generation + 1
+        assert repo.find_by_qualname("pkg.util.Box.get") is None
+    assert _qualnames(sqlite.all_elements()) == _qualnames(memory.all_elements())
+    assert _qualnames(sqlite.find_dependents("helper")) == _qualnames(memory.find_dependents("helper"))
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [{}, {"element_type": "FUNCTION"}, {"file": "pkg/util.py"}, {"name_prefix": "helper"},
+     {"qualname_prefix": "pkg.util."}, {"element_type": "CLASS", "qualname_prefix": "pkg."}],
+)
+def test_query_pages(analysed, filters):
+    _, _, _, memory, sqlite = analysed
+    expected = _qualnames(memory.query(**filters))
+    assert expected and expected == sorted(expected)
+    assert _qualnames(sqlite.query(**filters)) == expected
+    for repo in (memory, sqlite):
+        pages, after = [], None
+        while True:
+            page = _qualnames(repo.query(**filters, after=after, limit=2))
+            if not page:
+                break
+            assert len(page) <= 2
+            pages += page
+            after = page[-1]
+        assert pages == expected
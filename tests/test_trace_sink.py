@@ -0,0 +1,41 @@
+# pydiscovery/tests/test_trace_sink.py
+"""TraceSink / merge_trace: per‑thread breakdowns carry each process's names."""
+from __future__ import annotations
+
+from pydiscovery.analyzer.trace_sink import TraceSink, merge_trace
+
+EDGE = ("a.py:1:main", "a.py:5:work")
+
+
+def _stats(calls, threads):
+    return {"calls": calls, "inclusive_ns": calls * 10, "threads": threads}
+
+
+def _trace(path, edges, names):
+    sink = TraceSink(path)
+    sink.open()
+    sink.write(edges, thread_names=names)
+    sink.close()
+    return path
+
+
+def test_thread_names_applied_per_file(tmp_path):
+    # the same ident means a different thread in each process
+    first = _trace(tmp_path / "1.ndjson", {EDGE: _stats(3, {7: 2, 8: 1})}, {7: "MainThread", 8: "io"})
+    second = _trace(tmp_path / "2.ndjson", {EDGE: _stats(4, {7: 4})}, {7: "worker-1"})
+    edges = merge_trace([first, second])
+    assert edges[EDGE]["calls"] == 7
+    assert edges[EDGE]["threads"] == {"MainThread": 2, "io": 1, "worker-1": 4}
+
+
+def test_names_written_once(tmp_path):
+    path = tmp_path / "t.ndjson"
+    sink = TraceSink(path)
+    sink.open()
+    names = {7: "MainThread"}
+    sink.write({EDGE: _stats(1, {7: 1})}, thread_names=names)
+    names[9] = "late"  # a thread started after the first flush
+    sink.write({EDGE: _stats(2, {7: 1, 9: 1})}, thread_names=names)
+    sink.close()
+    assert path.read_text(encoding="utf-8").count('"kind":"threads"') == 2
+    assert merge_trace([path])[EDGE]["threads"] == {"MainThread": 2, "late": 1}
@@ -0,0 +1,72 @@
+# pydiscovery/tests/test_watcher.py
+"""ProjectWatcher: after poll() the graph must equal a fresh analysis."""
+from __future__ import annotations
+
+import json
+import os
+
+from pydiscovery.analyzer.code_analyzer import CodeAnalyzer
+from pydiscovery.analyzer.watcher import ProjectWatcher
+from pydiscovery.repository.in_memory_repository import InMemoryCodeElementRepository
+from pydiscovery.util.knowledge_graph_file_handler import KnowledgeGraphFileHandler
+
+SOURCES = {
+    "app.py": "import json\nfrom pkg.util import helper\n\n\ndef main():\n    return helper(json.dumps({}))\n",
+    "pkg/__init__.py": "",
+    "pkg/util.py": "import os\n\n\ndef helper(x):\n    return os.path.join(x, 'a')\n",
+    "pkg/old.py": "import re\n\n\ndef gone():\n    return re.compile('x')\n",
+}
+
+
+def _fresh(root):
+    return _same(CodeAnalyzer(InMemoryCodeElementRepository()).analyse_path(root))
+
+
+def _same(graph):
+    """*graph* as JSON, up to the order in which files were (re)analysed."""
+    graph = json.loads(json.dumps(graph, default=KnowledgeGraphFileHandler._json_default))
+    return dict(
+        graph,
+        files=sorted(graph["files"]),
+        elements=sorted(graph["elements"], key=lambda e: e.get("qualname", e["name"])),
+        external_dependencies=sorted(graph["external_dependencies"], key=lambda d: d["package"]),
+    )
+
+
+def _write(path, text, bump=0):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    if bump:  # a coarse mtime clock must still see the edit
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump))
+
+
+def test_poll_after_edit_add_delete(tmp_path):
+    for rel, text in SOURCES.items():
+        _write(tmp_path / rel, text)
+    analyzer = CodeAnalyzer(InMemoryCodeElementRepository())
+    watcher = ProjectWatcher(tmp_path, analyzer)
+    analyzer.analyse_path(tmp_path)
+    assert watcher.poll() == []
+
+    _write(tmp_path / "pkg/util.py", SOURCES["pkg/util.py"] + "\n\nclass Box:\n    pass\n", bump=10**9)
+    _write(tmp_path / "pkg/sub/new.py", "import shutil\n\n\ndef copy():\n    return shutil.copy\n")
+    (tmp_path / "pkg/old.py").unlink()
+    assert sorted(watcher.poll()) == ["pkg/old.py", "pkg/sub/new.py", "pkg/util.py"]
+    assert _same(analyzer.graph()) == _fresh(tmp_path)
+    assert watcher.poll() == []
+
+    # rewritten with the same content: rescanned, but nothing to re‑analyse
+    _write(tmp_path / "app.py", SOURCES["app.py"], bump=2 * 10**9)
+    assert watcher.poll() == []
+    assert _same(analyzer.graph()) == _fresh(tmp_path)
+
+
+def test_scan_skips_symlinked_dirs_and_other_files(tmp_path):
+    _write(tmp_path / "a.py", "x = 1\n")
+    _write(tmp_path / "notes.txt", "x\n")
+    _write(tmp_path / "outside/b.py", "y = 2\n")
+    project = tmp_path / "outside"
+    os.symlink(tmp_path, project / "loop")
+    watcher = ProjectWatcher(project, CodeAnalyzer(InMemoryCodeElementRepository()))
+    assert list(watcher.scan()) == ["b.py"]
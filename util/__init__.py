@@ -3,5 +3,7 @@ pydiscovery.util – helpers used across the toolkit.
 """
 
 from pydiscovery.util.knowledge_graph_file_handler import KnowledgeGraphFileHandler
+from pydiscovery.util.binary_graph import BinaryGraphReader, BinaryGraphWriter
+from pydiscovery.util.graph_delta import apply_delta, diff_graphs
 
-__all__ = ["KnowledgeGraphFileHandler"]
+__all__ = ["KnowledgeGraphFileHandler", "BinaryGraphReader", "BinaryGraphWriter", "apply_delta", "diff_graphs"]
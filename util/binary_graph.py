@@ -0,0 +1,229 @@
+"""
+Compact binary knowledge‑graph format (`knowledge_graph.pdkg`).
+
+Written alongside the JSON graph for consumers that load it at startup.
+Every string (ids, names, dependency targets) is stored **once** in a shared
+table; elements are fixed‑width records and dependency edges are arrays of
+string indices.  `BinaryGraphReader` `mmap`s the file and decodes elements
+only when asked, so opening a graph costs a header read, not a parse.
+`save()` writes a temporary file and renames it over the target, so a
+reader that has the old graph mapped keeps a consistent view.
+
+Layout (little‑endian)::
+
+    header    MAGIC, version, 6 × (offset, length) section table, counts
+    strings   (n + 1) × u64 offsets into the string blob, then UTF‑8 blob
+    elements  n × record  (id, type, name, qualname, dep_start, dep_count,
+                           extra_offset, extra_length)
+    edges     u32 string indices referenced by records
+    extras    compact JSON of each element's remaining fields
+    document  compact JSON of the non‑element keys (files, data_flows, …)
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from pydiscovery.util.knowledge_graph_file_handler import ROOT_DIR, KnowledgeGraphFileHandler
+
+BINARY_FILE = ROOT_DIR / "knowledge_graph.pdkg"
+
+MAGIC = b"PDKG"
+VERSION = 1
+_SECTIONS = ("string_offsets", "string_data", "elements", "edges", "extras", "document")
+_HEADER = struct.Struct("<4sHH" + "QQ" * len(_SECTIONS) + "III")
+_RECORD = struct.Struct("<6IQI")
+_FIXED_KEYS = ("id", "type", "name", "qualname", "dependencies")
+
+
+class BinaryGraphWriter:
+    FILE: Path = BINARY_FILE
+
+    @classmethod
+    def save(cls, data: Dict[str, Any], path: Path | None = None) -> Path:
+        """Encode *data* (a graph dict, `elements` may be a generator) to *path*."""
+        out = path or cls.FILE
+        strings: Dict[str, int] = {}
+
+        def intern(s: str) -> int:
+            idx = strings.get(s)
+            if idx is None:
+                idx = strings[s] = len(strings)
+            return idx
+
+        records = bytearray()
+        edges = array("I")
+        extras = bytearray()
+        n_elements = 0
+        for elt in data.get("elements", ()):
+            elt = KnowledgeGraphFileHandler._to_json_safe(elt)
+            name = intern(elt["name"])
+            deps = [intern(d) for d in elt.get("dependencies", ())]
+            extra = json.dumps(
+                {k: v for k, v in elt.items() if k not in _FIXED_KEYS}, separators=(",", ":")
+            ).encode("utf-8")
+            records += _RECORD.pack(
+                intern(elt["id"]),
+                intern(elt["type"]),
+                name,
+                intern(elt["qualname"]) if "qualname" in elt else name,
+                len(edges),
+                len(deps),
+                len(extras),
+                len(extra),
+            )
+            edges.extend(deps)
+            extras += extra
+            n_elements += 1
+
+        document = json.dumps(
+            KnowledgeGraphFileHandler._to_json_safe({k: v for k, v in data.items() if k != "elements"}),
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+        blob = bytearray()
+        offsets = array("Q", [0])
+        for s in strings:  # dicts keep insertion order == index order
+            blob += s.encode("utf-8")
+            offsets.append(len(blob))
+
+        if edges.itemsize != 4 or offsets.itemsize != 8:
+            raise RuntimeError("unsupported array item sizes on this platform")
+        sections = [offsets.tobytes(), bytes(blob), bytes(records), edges.tobytes(), bytes(extras), document]
+
+        table: List[int] = []
+        pos = _HEADER.size
+        for section in sections:
+            table += [pos, len(section)]
+            pos += len(section)
+        header = _HEADER.pack(MAGIC, VERSION, 0, *table, len(strings), n_elements, len(edges))
+
+        # never truncate a file readers may have mapped: write aside, then rename
+        tmp = out.with_name(out.name + ".tmp")
+        with tmp.open("wb") as fh:
+            fh.write(header)
+            for section in sections:
+                fh.write(section)
+        os.replace(tmp, out)
+        return out
+
+
+class BinaryGraphReader:
+    """
+    Memory‑mapped, lazily decoding view of a `.pdkg` file.
+
+    >>> with BinaryGraphReader() as g:
+    ...     print(len(g), g.element(0)["name"])
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or BINARY_FILE
+        self._fh = self.path.open("rb")
+        self._mm = None
+        try:
+            # an empty file cannot be mapped, a truncated one has no full header
+            size = os.fstat(self._fh.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError("too short")
+            self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+            fields = _HEADER.unpack_from(self._mm, 0)
+            if fields[0] != MAGIC or fields[1] != VERSION:
+                raise ValueError("bad magic or version")
+            # … or sections running past its end
+            table = fields[3:3 + 2 * len(_SECTIONS)]
+            if max(table[i] + table[i + 1] for i in range(0, len(table), 2)) > size:
+                raise ValueError("truncated")
+        except (ValueError, OSError) as err:
+            self.close()
+            raise ValueError(f"{self.path} is not a v{VERSION} PyDiscovery binary graph") from err
+        self._sections = {name: (table[2 * i], table[2 * i + 1]) for i, name in enumerate(_SECTIONS)}
+        self.string_count, self.element_count, self.edge_count = fields[3 + 2 * len(_SECTIONS):]
+        self._strings: Dict[int, str] = {}
+        self._name_index: Dict[str, List[int]] | None = None
+
+    # context manager ----------------------------------------------------
+    def __enter__(self) -> "BinaryGraphReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:  # noqa: ANN001
+        self.close()
+
+    def close(self) -> None:
+        if self._mm is not None and not self._mm.closed:
+            self._mm.close()
+        self._fh.close()
+
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self.element_count
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self.element_count):
+            yield self.element(i)
+
+    def string(self, idx: int) -> str:
+        s = self._strings.get(idx)
+        if s is None:
+            base, _ = self._sections["string_offsets"]
+            start, end = struct.unpack_from("<QQ", self._mm, base + 8 * idx)
+            data_base, _ = self._sections["string_data"]
+            s = self._strings[idx] = self._mm[data_base + start:data_base + end].decode("utf-8")
+        return s
+
+    def name(self, i: int) -> str:
+        """Bare name of element *i* without decoding the rest of the record."""
+        return self.string(self._record(i)[2])
+
+    def dependencies(self, i: int) -> List[str]:
+        _, _, _, _, dep_start, dep_count, _, _ = self._record(i)
+        base, _ = self._sections["edges"]
+        idxs = struct.unpack_from(f"<{dep_count}I", self._mm, base + 4 * dep_start)
+        return [self.string(j) for j in idxs]
+
+    def element(self, i: int) -> Dict[str, Any]:
+        """Decode element *i* into the same dict `CodeElement.to_dict()` produced."""
+        id_, type_, name, qualname, _, _, extra_off, extra_len = self._record(i)
+        out: Dict[str, Any] = {"id": self.string(id_), "type": self.string(type_), "name": self.string(name)}
+        if qualname != name:
+            out["qualname"] = self.string(qualname)
+        out["dependencies"] = self.dependencies(i)
+        base, _ = self._sections["extras"]
+        out.update(json.loads(self._mm[base + extra_off:base + extra_off + extra_len]))
+        return out
+
+    def find(self, name: str) -> List[Dict[str, Any]]:
+        """All elements whose bare name is *name* (index built on first use)."""
+        if self._name_index is None:
+            index: Dict[str, List[int]] = {}
+            for i in range(self.element_count):
+                index.setdefault(self.name(i), []).append(i)
+            self._name_index = index
+        return [self.element(i) for i in self._name_index.get(name, ())]
+
+    def document(self) -> Dict[str, Any]:
+        """Non‑element graph keys: files, data_flows, external_dependencies, root …"""
+        base, length = self._sections["document"]
+        return json.loads(self._mm[base:base + length])
+
+    def to_graph(self) -> Dict[str, Any]:
+        """Fully decode into the JSON graph shape (defeats laziness – for tools)."""
+        graph: Dict[str, Any] = {}
+        for key, value in self.document().items():
+            graph[key] = value
+            if key == "files":  # elements follow files, as in knowledge_graph.json
+                graph["elements"] = list(self)
+        graph.setdefault("elements", list(self))
+        return graph
+
+    # ------------------------------------------------------------------
+    def _record(self, i: int) -> tuple:
+        if not 0 <= i < self.element_count:
+            raise IndexError(i)
+        base, _ = self._sections["elements"]
+        return _RECORD.unpack_from(self._mm, base + _RECORD.size * i)
+
@@ -0,0 +1,199 @@
+"""
+Compact deltas between two knowledge graphs.
+
+`diff_graphs(old, new)` describes what changed from one analysis run to the
+next; `apply_delta(base, delta)` patches *base* (the `old` graph) into the
+`new` one.  Consumers that already hold the previous graph then only move
+a few kilobytes per commit instead of the whole file.
+
+Elements are matched by qualified name (the repository key), external
+packages by name.  A changed element lists only the fields that differ –
+dict fields such as ``metadata`` key by key (a shifted function costs just
+its new ``lines``) – with its dependencies as added / removed sets::
+
+    {
+      "format": "pydiscovery-delta/1",
+      "base": "<old analysis_id>", "target": "<new analysis_id>",
+      "header":   {"analysis_id": …},                       # changed scalars
+      "files":    {"added": [...], "removed": [...]},
+      "elements": {"added": [<element>…], "removed": [<qualname>…],
+                   "changed": [{"qualname": …, "set": {…}, "unset": [...],
+                                "patch": {"metadata": {"set": {…}, "unset": [...]}},
+                                "dependencies": {"added": [...], "removed": [...]}}]},
+      "data_flows": {"set": {<file>: …}, "removed": [...]},
+      "external_dependencies": {"set": [<package record>…], "removed": [<package>…]}
+    }
+
+Only non‑empty sections are written.  `apply_delta()` keeps the base
+order and appends new entries, so element order may differ from a fresh
+run while the content is identical.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+from pydiscovery.util.knowledge_graph_file_handler import KnowledgeGraphFileHandler
+
+FORMAT = "pydiscovery-delta/1"
+
+# graph keys handled as collections; any other top-level key is a header scalar
+_BODY_KEYS = ("files", "elements", "data_flows", "external_dependencies")
+
+
+def diff_graphs(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """The delta turning graph *old* into graph *new* (both plain dicts)."""
+    delta: Dict[str, Any] = {"format": FORMAT, "base": old.get("analysis_id"), "target": new.get("analysis_id")}
+
+    header = {k: v for k, v in new.items() if k not in _BODY_KEYS and old.get(k) != v}
+    dropped = [k for k in old if k not in _BODY_KEYS and k not in new]
+    if header or dropped:
+        delta["header"] = dict(header, **({"unset": dropped} if dropped else {}))
+
+    old_files, new_files = set(old.get("files", ())), set(new.get("files", ()))
+    _put(delta, "files", added=[f for f in new.get("files", ()) if f not in old_files],
+         removed=sorted(old_files - new_files))
+
+    old_elts = {_key(e): e for e in old.get("elements", ())}
+    new_elts = {_key(e): e for e in new.get("elements", ())}
+    changed = []
+    for key, elt in new_elts.items():
+        before = old_elts.get(key)
+        if before is not None and before != elt:
+            changed.append(_diff_element(key, before, elt))
+    _put(delta, "elements",
+         added=[e for k, e in new_elts.items() if k not in old_elts],
+         removed=sorted(k for k in old_elts if k not in new_elts),
+         changed=changed)
+
+    old_flows, new_flows = old.get("data_flows") or {}, new.get("data_flows") or {}
+    _put(delta, "data_flows",
+         set={f: v for f, v in new_flows.items() if old_flows.get(f) != v},
+         removed=sorted(f for f in old_flows if f not in new_flows))
+
+    old_deps = {d["package"]: d for d in old.get("external_dependencies", ())}
+    new_deps = {d["package"]: d for d in new.get("external_dependencies", ())}
+    _put(delta, "external_dependencies",
+         set=[d for p, d in new_deps.items() if old_deps.get(p) != d],
+         removed=sorted(p for p in old_deps if p not in new_deps))
+    return delta
+
+
+def apply_delta(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Return *base* patched with *delta* (*base* itself is left untouched)."""
+    if delta.get("format") != FORMAT:
+        raise ValueError(f"not a {FORMAT} delta: {delta.get('format')!r}")
+    if delta.get("base") != base.get("analysis_id"):
+        raise ValueError(f"delta is based on analysis {delta.get('base')!r}, not {base.get('analysis_id')!r}")
+    out = dict(base)
+
+    header = dict(delta.get("header", {}))
+    for key in header.pop("unset", ()):
+        out.pop(key, None)
+    out.update(header)
+
+    files = delta.get("files", {})
+    removed = set(files.get("removed", ()))
+    out["files"] = [f for f in base.get("files", ()) if f not in removed] + files.get("added", [])
+
+    elts = delta.get("elements", {})
+    removed = set(elts.get("removed", ()))
+    changes = {c["qualname"]: c for c in elts.get("changed", ())}
+    elements = []
+    for elt in base.get("elements", ()):
+        key = _key(elt)
+        if key in removed:
+            continue
+        change = changes.get(key)
+        elements.append(_patch_element(elt, change) if change else elt)
+    out["elements"] = elements + elts.get("added", [])
+
+    flows = delta.get("data_flows", {})
+    merged = {f: v for f, v in (base.get("data_flows") or {}).items() if f not in set(flows.get("removed", ()))}
+    merged.update(flows.get("set", {}))
+    out["data_flows"] = merged
+
+    deps = delta.get("external_dependencies", {})
+    updates = {d["package"]: d for d in deps.get("set", ())}
+    removed = set(deps.get("removed", ()))
+    kept = [
+        updates.pop(d["package"], d)
+        for d in base.get("external_dependencies", ())
+        if d["package"] not in removed
+    ]
+    out["external_dependencies"] = kept + list(updates.values())
+    return out
+
+
+def load_graph(path: Path | str) -> Dict[str, Any]:
+    """Read a knowledge graph written as JSON or NDJSON (by file suffix)."""
+    path = Path(path)
+    if path.suffix != ".ndjson":
+        with path.open("r", encoding="utf-8") as fh:
+            return json.load(fh)
+    graph: Dict[str, Any] = {"files": [], "elements": [], "data_flows": {}, "external_dependencies": []}
+    for record in KnowledgeGraphFileHandler.iter_ndjson(path):
+        kind = record.pop("kind")
+        if kind == "header":
+            graph.update(record)
+        elif kind == "file":
+            graph["files"].append(record["path"])
+            if "data_flows" in record:
+                graph["data_flows"][record["path"]] = record["data_flows"]
+        elif kind == "element":
+            graph["elements"].append(record)
+        elif kind == "dependency":
+            graph["external_dependencies"].append(record)
+    return graph
+
+
+# ---------------------------------------------------------------------------
+def _key(elt: Dict[str, Any]) -> str:
+    return elt.get("qualname", elt["name"])  # to_dict() omits a redundant qualname
+
+
+def _diff_element(key: str, before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    change: Dict[str, Any] = {"qualname": key}
+    fields, nested = {}, {}
+    for k, v in after.items():
+        old = before.get(k)
+        if k == "dependencies" or old == v:
+            continue
+        if isinstance(old, dict) and isinstance(v, dict):
+            _put(nested, k, set={sk: sv for sk, sv in v.items() if old.get(sk) != sv},
+                 unset=[sk for sk in old if sk not in v])
+        else:
+            fields[k] = v
+    unset = [k for k in before if k not in after]
+    if fields:
+        change["set"] = fields
+    if unset:
+        change["unset"] = unset
+    if nested:
+        change["patch"] = nested
+    old_deps, new_deps = set(before.get("dependencies", ())), set(after.get("dependencies", ()))
+    if old_deps != new_deps:
+        change["dependencies"] = {"added": sorted(new_deps - old_deps), "removed": sorted(old_deps - new_deps)}
+    return change
+
+
+def _patch_element(elt: Dict[str, Any], change: Dict[str, Any]) -> Dict[str, Any]:
+    out = {k: v for k, v in elt.items() if k not in change.get("unset", ())}
+    out.update(change.get("set", {}))
+    for k, sub in change.get("patch", {}).items():
+        value = {sk: sv for sk, sv in out.get(k, {}).items() if sk not in sub.get("unset", ())}
+        value.update(sub.get("set", {}))
+        out[k] = value
+    deps = change.get("dependencies")
+    if deps:
+        removed = set(deps["removed"])
+        out["dependencies"] = sorted({d for d in elt.get("dependencies", ()) if d not in removed} | set(deps["added"]))
+    return out
+
+
+def _put(delta: Dict[str, Any], section: str, **parts: Iterable[Any]) -> None:
+    """Add *section* with its non‑empty *parts*; skip it when all are empty."""
+    kept = {name: part for name, part in parts.items() if part}
+    if kept:
+        delta[section] = kept
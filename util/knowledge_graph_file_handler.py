@@ -6,37 +6,159 @@ Changes
 * Always **overwrite** (no deep‑merge).
 * `FILE` is anchored in the pydiscovery package root folder, so the graph
   lands at   pydiscovery/knowledge_graph.json   every run.
+* Written **incrementally**: top‑level lists / dicts (and generators, e.g.
+  lazily converted elements) are encoded one entry at a time, so peak
+  memory does not grow with the size of the JSON text.  `compact=True`
+  drops indentation.
+* `save_ndjson()` writes JSON Lines instead: a header record with the
+  scalar keys (`root`, `analysis_id`, …) followed by one record per element,
+  file and external dependency – greppable, shardable and streamable.
+* Both write a temporary file and rename it over the target, so readers
+  (e.g. of a graph kept live by `launcher --watch`) never see half a graph.
 """
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, TextIO
 
 
 # pydiscovery package root … /pydiscovery
 ROOT_DIR = Path(__file__).resolve().parents[1]
 OUTPUT_FILE = ROOT_DIR / "knowledge_graph.json"
+NDJSON_FILE = ROOT_DIR / "knowledge_graph.ndjson"
+
+# graph keys that become per‑line records in NDJSON; everything else is header
+_RECORD_KEYS = ("files", "elements", "data_flows", "external_dependencies")
+
+# depth up to which containers are streamed entry by entry; deeper values are
+# handed to json.dumps whole (fast C encoder, bounded by a single element)
+_STREAM_DEPTH = 2
 
 
 class KnowledgeGraphFileHandler:
     FILE: Path = OUTPUT_FILE  # public constant
+    NDJSON_FILE: Path = NDJSON_FILE
+
+    # ----------------------------------------------------------------- #
+    @classmethod
+    def save(cls, data: Dict[str, Any], compact: bool = False, path: Path | None = None) -> Path:
+        """Stream *data* (after sanitising sets / Path) to *path* (default FILE)."""
+        out = path or cls.FILE
+        tmp = out.with_name(out.name + ".tmp")
+        with tmp.open("w", encoding="utf-8", buffering=1 << 16) as fh:
+            cls.write(data, fh, compact=compact)
+        os.replace(tmp, out)
+        return out
+
+    @classmethod
+    def write(cls, data: Dict[str, Any], fh: TextIO, compact: bool = False) -> None:
+        """Encode *data* into the open text stream *fh*, chunk by chunk."""
+        for chunk in cls._iter_encode(data, None if compact else 2, 0):
+            fh.write(chunk)
 
     # ----------------------------------------------------------------- #
     @classmethod
-    def save(cls, data: Dict[str, Any]) -> None:
-        """Serialise *data* (after sanitising sets / Path) to FILE."""
-        serialisable = cls._to_json_safe(data)
-        cls.FILE.write_text(json.dumps(serialisable, indent=2), encoding="utf-8")
+    def save_ndjson(cls, data: Dict[str, Any], path: Path | None = None) -> Path:
+        """
+        Write *data* as JSON Lines to *path* (default NDJSON_FILE).  Each line
+        carries a `"kind"`: `header`, `file` (with its data flows), `element`
+        or `dependency`.
+        """
+        out = path or cls.NDJSON_FILE
+        tmp = out.with_name(out.name + ".tmp")
+        with tmp.open("w", encoding="utf-8", buffering=1 << 16) as fh:
+            for record in cls._iter_records(data):
+                fh.write(json.dumps(record, separators=(",", ":"), default=cls._json_default))
+                fh.write("\n")
+        os.replace(tmp, out)
+        return out
 
     @staticmethod
-    def _to_json_safe(obj: Any) -> Any:
-        """Convert sets ➜ lists, Path ➜ str, recurse into containers."""
-        from pathlib import Path  # local import to avoid circulars
+    def iter_ndjson(path: Path | None = None) -> Iterator[Dict[str, Any]]:
+        """Yield the records of an NDJSON graph one at a time."""
+        with (path or KnowledgeGraphFileHandler.NDJSON_FILE).open("r", encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+    @staticmethod
+    def _iter_records(data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        yield {"kind": "header", **{k: v for k, v in data.items() if k not in _RECORD_KEYS}}
+        flows = data.get("data_flows") or {}
+        for rel in data.get("files", ()):
+            record: Dict[str, Any] = {"kind": "file", "path": rel}
+            if rel in flows:
+                record["data_flows"] = flows[rel]
+            yield record
+        for elt in data.get("elements", ()):
+            yield {"kind": "element", **elt}
+        for dep in data.get("external_dependencies", ()):
+            yield {"kind": "dependency", **dep}
+
+    # ----------------------------------------------------------------- #
+    @classmethod
+    def _iter_encode(cls, obj: Any, indent: int | None, level: int) -> Iterator[str]:
+        """
+        Yield JSON text for *obj*; matches `json.dumps(obj, indent=indent)`
+        (or compact separators when *indent* is None).
+        """
+        if level >= _STREAM_DEPTH or not cls._is_container(obj):
+            text = json.dumps(
+                obj,
+                indent=indent,
+                separators=(",", ":") if indent is None else None,
+                default=cls._json_default,
+            )
+            if indent is not None:
+                text = text.replace("\n", "\n" + " " * (indent * level))
+            yield text
+            return
 
+        if isinstance(obj, dict):
+            entries = ((json.dumps(str(k)) + (": " if indent is not None else ":"), v) for k, v in obj.items())
+            opening, closing = "{", "}"
+        else:
+            if isinstance(obj, set):
+                obj = sorted(obj)
+            entries = (("", v) for v in obj)
+            opening, closing = "[", "]"
+
+        if indent is None:
+            sep, pad, end = ",", "", ""
+        else:
+            pad = "\n" + " " * (indent * (level + 1))
+            sep, end = "," + pad, "\n" + " " * (indent * level)
+
+        first = True
+        for prefix, value in entries:
+            yield (opening + pad if first else sep) + prefix
+            first = False
+            yield from cls._iter_encode(value, indent, level + 1)
+        yield opening + closing if first else end + closing
+
+    @staticmethod
+    def _is_container(obj: Any) -> bool:
+        return isinstance(obj, (dict, list, tuple, set)) or (
+            hasattr(obj, "__next__") and hasattr(obj, "__iter__")  # generators / iterators
+        )
+
+    @staticmethod
+    def _json_default(obj: Any) -> Any:
+        """`json.dumps` hook with `_to_json_safe`'s conversions, only where needed."""
+        if isinstance(obj, set):
+            return sorted(obj)
+        if isinstance(obj, Path):
+            return str(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    @staticmethod
+    def _to_json_safe(obj: Any) -> Any:
+        """Convert sets / tuples ➜ lists, Path ➜ str, recurse into containers."""
         if isinstance(obj, dict):
             return {k: KnowledgeGraphFileHandler._to_json_safe(v) for k, v in obj.items()}
-        if isinstance(obj, list):
+        if isinstance(obj, (list, tuple)):
             return [KnowledgeGraphFileHandler._to_json_safe(v) for v in obj]
         if isinstance(obj, set):
             return [KnowledgeGraphFileHandler._to_json_safe(v) for v in sorted(obj)]